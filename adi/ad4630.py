@@ -11,18 +11,6 @@ from adi.context_manager import context_manager
 from adi.rx_tx import rx
 
 
-def _sign_extend(value, nbits):
-    sign_bit = 1 << (nbits - 1)
-    return (value & (sign_bit - 1)) - (value & sign_bit)
-
-
-def _bitmask(nbits):
-    mask = 0
-    for i in range(0, nbits):
-        mask = (mask << 1) | 1
-    return mask
-
-
 class ad4630(rx, context_manager, attribute):
 
     """ AD4630 is low power precision SAR ADC family supporting 16-bit, 20-bit, and 24-bit variants """
@@ -71,23 +59,17 @@ class ad4630(rx, context_manager, attribute):
 
     def rx(self):
         data = self._rx_buffered_data()
-        temp = []
         if self._num_rx_channels != 2:
+            temp = []
             for ch in range(0, self._num_rx_channels):
-                nbits = self._ctrl.channels[ch].data_format.bits
-                shift = self._ctrl.channels[ch].data_format.shift
-                ch_data = np.zeros(data[int(ch / 2)].shape, dtype=np.uint32)
-                for index in range(0, len(data[int(ch / 2)])):
-                    ch_data[index] = (data[int(ch / 2)][index] >> shift) & _bitmask(
-                        nbits
-                    )
-                temp.append(np.vectorize(_sign_extend)(ch_data, nbits))
+                df = self._ctrl.channels[ch].data_format
+                ch_data = np.asarray(data[int(ch / 2)]).astype(np.uint32, copy=False)
+                temp.append(self._rx_decode(ch_data, df.bits, df.shift))
             data = temp
         else:
-            for idx, ch_data in enumerate(data):
-                nbits = self._ctrl.channels[idx].data_format.bits
-                temp.append(np.vectorize(_sign_extend)(ch_data, nbits))
-            data = np.vectorize(_sign_extend)(data, nbits)
+            nbits = self._ctrl.channels[-1].data_format.bits
+            data = np.asarray(data).astype(np.uint32, copy=False)
+            data = self._rx_decode(data, nbits)
 
         return data
 
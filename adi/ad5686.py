@@ -4,7 +4,7 @@
 
 import numpy as np
 
-from adi.attribute import attribute
+from adi.attribute import IIOAttr, attribute
 from adi.device_base import tx_chan_comp_no_buff
 
 
@@ -24,35 +24,36 @@ class ad5686_channel(attribute):
     def raw(self, value):
         self._set_iio_attr(self.name, "raw", True, str(int(value)))
 
-    @property
-    def powerdown(self):
-        """AD5686 channel powerdown value"""
-        return self._get_iio_attr(self.name, "powerdown", True)
-
-    @powerdown.setter
-    def powerdown(self, val):
-        """AD5686 channel powerdown value"""
-        self._set_iio_attr(self.name, "powerdown", True, val)
-
-    @property
-    def powerdown_mode(self):
-        """AD5686 channel powerdown mode value"""
-        return self._get_iio_attr_str(self.name, "powerdown_mode", True)
-
-    @powerdown_mode.setter
-    def powerdown_mode(self, val):
-        """AD5686 channel powerdown value"""
-        self._set_iio_attr_str(self.name, "powerdown_mode", True, val)
-
-    @property
-    def powerdown_mode_available(self):
-        """Provides all available powerdown mode settings for the AD5686"""
-        return self._get_iio_attr_str(self.name, "powerdown_mode_available", True)
-
-    @property
-    def scale(self):
-        """AD5686 channel scale(gain)"""
-        return self._get_iio_attr(self.name, "scale", True)
+    powerdown = IIOAttr(
+        lambda self: self.name,
+        "powerdown",
+        int,
+        True,
+        doc="AD5686 channel powerdown value",
+    )
+    powerdown_mode = IIOAttr(
+        lambda self: self.name,
+        "powerdown_mode",
+        str,
+        True,
+        doc="AD5686 channel powerdown mode value",
+    )
+    powerdown_mode_available = IIOAttr(
+        lambda self: self.name,
+        "powerdown_mode_available",
+        str,
+        True,
+        readonly=True,
+        doc="Provides all available powerdown mode settings for the AD5686",
+    )
+    scale = IIOAttr(
+        lambda self: self.name,
+        "scale",
+        float,
+        True,
+        readonly=True,
+        doc="AD5686 channel scale(gain)",
+    )
 
     def to_raw(self, val):
         """Converts raw value to SI"""
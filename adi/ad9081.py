@@ -74,6 +74,13 @@ class ad9081(rx_tx, context_manager, sync_start):
     _tx_fine_duc_channel_names: List[str] = []
     _dds_channel_names: List[str] = []
     _device_name = ""
+    _attr_dependencies = {
+        "main_nco_ffh_frequency": ["main_nco_ffh_index"],
+        "main_nco_ffh_select": ["main_nco_ffh_index", "main_nco_ffh_frequency"],
+        "main_nco_test_tone_en": ["main_nco_test_tone_scale"],
+        "channel_nco_test_tone_en": ["channel_nco_test_tone_scale"],
+        "jesd204_fsm_resume": ["jesd204_fsm_ctrl"],
+    }
 
     _path_map: Dict[str, Dict[str, Dict[str, List[str]]]] = {}
 
@@ -27,6 +27,18 @@ class adrv9009(rx_tx, context_manager, sync_start):
     _tx_channel_names = ["voltage0", "voltage1", "voltage2", "voltage3"]
     _obs_channel_names = ["voltage0_i", "voltage0_q"]
     _device_name = ""
+    _attr_dependencies = {
+        "frequency": ["profile_config"],
+        "gain_control_mode": ["profile_config"],
+        "hardwaregain": ["profile_config", "gain_control_mode"],
+        "calibrate": [
+            "profile_config",
+            "frequency",
+            "calibrate_rx_phase_correction_en",
+            "calibrate_rx_qec_en",
+            "calibrate_tx_qec_en",
+        ],
+    }
 
     def __init__(self, uri="", jesd_monitor=False, jesd=None):
 
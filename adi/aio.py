@@ -0,0 +1,92 @@
+# Copyright (C) 2026 Analog Devices, Inc.
+#
+# SPDX short identifier: ADIBSD
+
+"""Executors used by the asyncio methods of devices.
+
+libiio contexts are not safe to use from several threads at once, so every
+context gets a single worker thread. All awaitable calls on devices sharing
+a context run on that thread in submission order, while calls on different
+contexts run concurrently.
+"""
+
+import asyncio
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+
+# Keyed by id() of the context: libiio v1 contexts are not hashable
+_executors = {}
+_executors_lock = threading.Lock()
+_worker = threading.local()
+
+
+def _mark_worker():
+    _worker.active = True
+
+
+def in_context_worker() -> bool:
+    """True when called from the worker thread of a context executor"""
+    return getattr(_worker, "active", False)
+
+
+def _libiio_context(dev):
+    # Older bindings wrap the context of a device in a weak reference
+    ctx = getattr(dev, "ctx", None)
+    if isinstance(ctx, weakref.ref):
+        ctx = ctx()
+    return ctx
+
+
+def _context_of(dev):
+    # pyadi-iio devices hold their context in _ctx, libiio devices in ctx,
+    # and channel classes such as ad5686_channel only the libiio device
+    # in _ctrl
+    ctx = getattr(dev, "_ctx", None)
+    if ctx is None:
+        ctx = _libiio_context(dev)
+    if ctx is None:
+        ctx = _libiio_context(getattr(dev, "_ctrl", None))
+    return dev if ctx is None else ctx
+
+
+def _retire(key_id: int, executor: ThreadPoolExecutor):
+    # Runs from garbage collection, possibly while _executors_lock is held
+    _executors.pop(key_id, None)
+    executor.shutdown(wait=False)
+
+
+def context_executor(dev) -> ThreadPoolExecutor:
+    """Single thread executor serializing calls on the context of dev.
+
+    dev is a device class or a libiio device. Devices without a context get
+    an executor of their own. The executor is shut down when the context is
+    garbage collected.
+    """
+    key = _context_of(dev)
+    with _executors_lock:
+        executor = _executors.get(id(key))
+        if executor is None:
+            executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="iio_ctx", initializer=_mark_worker
+            )
+            _executors[id(key)] = executor
+            weakref.finalize(key, _retire, id(key), executor)
+    return executor
+
+
+async def run_in_context(dev, func, *args, on_cancel=None, **kwargs):
+    """Run func(*args, **kwargs) on the executor of dev and await the result.
+
+    When the awaiting task is cancelled, a call which has not started yet is
+    dropped. A call which is already running cannot be interrupted from
+    Python, so on_cancel is invoked to unblock it, for example by cancelling
+    a pending buffer refill.
+    """
+    future = context_executor(dev).submit(func, *args, **kwargs)
+    try:
+        return await asyncio.wrap_future(future)
+    except asyncio.CancelledError:
+        if not future.cancelled() and on_cancel:
+            on_cancel()
+        raise
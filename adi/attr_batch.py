@@ -0,0 +1,114 @@
+# Copyright (C) 2026 Analog Devices, Inc.
+#
+# SPDX short identifier: ADIBSD
+
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+
+class attr_batch_error(Exception):
+    """Raised when writes of a batch failed.
+
+    Attributes:
+        failures: List of (attribute, value, exception) tuples in write order
+    """
+
+    def __init__(self, failures):
+        self.failures = failures
+        details = "; ".join(f"{name}={value}: {ex}" for name, value, ex in failures)
+        super().__init__(f"{len(failures)} batched write(s) failed: {details}")
+
+
+def _describe(key) -> str:
+    dev, channel_name, output, attr_name = key
+    dev_name = getattr(dev, "name", None) or "device"
+    if output is None:
+        if channel_name == "debug":
+            return f"{dev_name}/debug/{attr_name}"
+        return f"{dev_name}/{attr_name}"
+    direction = "out" if output else "in"
+    return f"{dev_name}/{channel_name}({direction})/{attr_name}"
+
+
+def _same_value(cached: str, value: str) -> bool:
+    if cached.strip() == value.strip():
+        return True
+    # Numbers written as floats, such as "1000.0" for "1000"
+    try:
+        return float(cached) == float(value)
+    except ValueError:
+        return False
+
+
+class attr_batch:
+    """Attribute writes collected by attribute.batch().
+
+    Writes to the same attribute are coalesced so only the last value is
+    written, and writes of the value already held by the attribute cache
+    are dropped. The remaining writes keep the order of their last
+    assignment, except that an attribute is written after every pending
+    attribute it depends on.
+
+    Attributes:
+        dropped: Number of writes dropped as unchanged or superseded
+    """
+
+    def __init__(self, owner, dependencies: Optional[Dict[str, List[str]]] = None):
+        self._owner = owner
+        self._writes = OrderedDict()
+        self.dependencies = dict(owner._attr_dependencies)
+        self.dependencies.update(dependencies or {})
+        self.dropped = 0
+
+    def __len__(self):
+        return len(self._writes)
+
+    def _add(self, key, value: str):
+        # libiio v1 devices are not hashable, so they are keyed by identity
+        write_key = (id(key[0]),) + key[1:]
+        if write_key in self._writes:
+            self.dropped += 1
+            del self._writes[write_key]
+        self._writes[write_key] = (key, value)
+
+    def _ordered(self):
+        """Pending writes sorted so dependencies are written first.
+        Cyclic dependencies keep the assignment order.
+        """
+        writes = list(self._writes.values())
+        order = []
+        while writes:
+            pending = {key[-1] for key, _ in writes}
+            for i, (key, _) in enumerate(writes):
+                deps = self.dependencies.get(key[-1], ())
+                if not any(d in pending and d != key[-1] for d in deps):
+                    break
+            else:
+                i = 0
+            order.append(writes.pop(i))
+        return order
+
+    def flush(self):
+        """Write the pending values and raise attr_batch_error listing every
+        failed write. Called when the with block of attribute.batch() ends.
+        """
+        owner = self._owner
+        cache = owner._attr_cache
+        writes = self._ordered()
+        # Every write invalidates the cache, so look up values beforehand
+        if cache is not None:
+            snapshot = [cache.peek(key) for key, _ in writes]
+        else:
+            snapshot = [None] * len(writes)
+        failures = []
+        for (key, value), cached in zip(writes, snapshot):
+            if cached is not None and _same_value(cached, value):
+                self.dropped += 1
+                continue
+            try:
+                owner._attr_write(key, value)
+            except Exception as ex:  # noqa: BLE001
+                failures.append((_describe(key), value, ex))
+        self._writes.clear()
+        if failures:
+            raise attr_batch_error(failures)
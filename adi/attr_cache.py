@@ -0,0 +1,144 @@
+# Copyright (C) 2026 Analog Devices, Inc.
+#
+# SPDX short identifier: ADIBSD
+
+import math
+import threading
+import time
+import weakref
+from fnmatch import fnmatchcase
+from typing import List, Optional, Tuple
+
+# Attribute name patterns and how long their values stay valid in seconds.
+# The first matching pattern applies. math.inf never expires, 0 never caches.
+_DEFAULT_POLICIES = [
+    ("raw", 0),
+    ("*_raw", 0),
+    ("input", 0.1),
+    ("*_input", 0.1),
+    ("processed", 0.1),
+    ("*_available", math.inf),
+    ("name", math.inf),
+    ("label", math.inf),
+    ("serial_number", math.inf),
+]
+
+
+def _entry_key(key: tuple):
+    """Hashable form of key and the object whose id() it contains.
+
+    libiio v1 devices are not hashable, and Context.find_device() returns a
+    new device object on every call, so libiio devices are identified by
+    their context and device id. Other objects are identified by id(). The
+    entry keeps a reference to that object, so its id() cannot be reused by
+    another object while the entry exists.
+    """
+    dev = key[0]
+    dev_id = getattr(dev, "id", None)
+    ctx = getattr(dev, "ctx", None)
+    if isinstance(ctx, weakref.ref):
+        ctx = ctx()
+    if isinstance(dev_id, str) and ctx is not None:
+        return (id(ctx), dev_id) + key[1:], ctx
+    return (id(dev),) + key[1:], dev
+
+
+class attr_cache:
+    """Read cache for IIO attributes with per attribute lifetimes.
+
+    Entries are keyed by device, channel, direction and attribute name. The
+    lifetime of a value comes from the first policy whose pattern matches
+    the attribute name, or default_ttl when none matches. Writing an
+    attribute drops every cached value which can expire, since one write
+    often changes other attributes of a driver, together with all cached
+    values of the written attribute.
+
+    Attributes:
+        hits: Number of reads answered from the cache
+        misses: Number of reads which went to the device
+    """
+
+    def __init__(
+        self,
+        default_ttl: float = 1.0,
+        policies: Optional[List[Tuple[str, float]]] = None,
+    ):
+        self.default_ttl = default_ttl
+        self.policies = list(policies or []) + _DEFAULT_POLICIES
+        self._ttls = {}
+        self._entries = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def ttl(self, attr_name: str) -> float:
+        """Lifetime in seconds of cached values of attr_name"""
+        ttl = self._ttls.get(attr_name)
+        if ttl is None:
+            ttl = next(
+                (t for p, t in self.policies if fnmatchcase(attr_name, p)),
+                self.default_ttl,
+            )
+            self._ttls[attr_name] = ttl
+        return ttl
+
+    def get(self, key: tuple, read):
+        """Return the cached value of key, or read() and cache the result.
+        key starts with the device and ends with the attribute name.
+        """
+        now = time.monotonic()
+        key, owner = _entry_key(key)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[2] is owner and entry[1] > now:
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+        value = read()
+        ttl = self.ttl(key[-1])
+        if ttl > 0:
+            with self._lock:
+                self._entries[key] = (value, now + ttl, owner)
+        return value
+
+    def peek(self, key: tuple):
+        """Cached value of key if it has not expired, otherwise None.
+        Does not count as a hit or miss.
+        """
+        key, owner = _entry_key(key)
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is not None and entry[2] is owner and entry[1] > time.monotonic():
+            return entry[0]
+        return None
+
+    def invalidate(self, attr_name: Optional[str] = None):
+        """Drop values which can expire and all values of attr_name"""
+        with self._lock:
+            self._entries = {
+                k: e
+                for k, e in self._entries.items()
+                if e[1] == math.inf and k[-1] != attr_name
+            }
+
+    def clear(self):
+        """Drop all cached values and reset the counters"""
+        with self._lock:
+            self._entries = {}
+            self.hits = 0
+            self.misses = 0
+
+    @property
+    def hit_rate(self) -> Optional[float]:
+        """hit_rate: Fraction of reads answered from the cache"""
+        total = self.hits + self.misses
+        return self.hits / total if total else None
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __repr__(self):
+        return (
+            f"attr_cache(entries={len(self)}, hits={self.hits}, "
+            f"misses={self.misses})"
+        )
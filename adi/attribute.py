@@ -2,7 +2,15 @@
 #
 # SPDX short identifier: ADIBSD
 
+import numbers
 import re
+from concurrent.futures import wait
+from contextlib import contextmanager
+
+from adi.aio import context_executor, in_context_worker, run_in_context
+from adi.attr_batch import attr_batch
+from adi.attr_cache import attr_cache
+from adi.channel_table import find_channel
 
 
 def get_numbers(s):
@@ -15,20 +23,221 @@ def get_numbers(s):
     return v
 
 
+# Separators of list attributes such as "1 2 3" or "[1 1 100]"
+_LIST_SPLIT = re.compile(r"[\s,\[\]]+")
+
+
+def _parse_float(s):
+    try:
+        return float(s)
+    except ValueError:
+        pass
+    try:
+        # Values followed by a unit, such as "71.000000 dB"
+        return float(s.split(None, 1)[0])
+    except (ValueError, IndexError):
+        v = get_numbers(s)
+        if isinstance(v, list):
+            raise ValueError(f"Not a number: {s!r}")
+        return float(v)
+
+
+def _parse_int(s):
+    try:
+        return int(s)
+    except ValueError:
+        return int(_parse_float(s))
+
+
+def _parse_list(s):
+    try:
+        return [float(v) for v in _LIST_SPLIT.split(s) if v]
+    except ValueError:
+        v = get_numbers(s)
+        return v if isinstance(v, list) else [float(v)]
+
+
+def _format_list(value):
+    return " ".join(str(v) for v in value)
+
+
+def _check_int(value):
+    if not isinstance(value, numbers.Integral):
+        raise Exception("Value must be an int")
+    return value
+
+
+def _check_float(value):
+    if isinstance(value, numbers.Integral):
+        value = float(value)
+    if not isinstance(value, numbers.Real):
+        raise Exception("Value must be a float")
+    return value
+
+
 class attribute:
+    _attr_cache = None
+    _attr_batch = None
+    # Attribute name -> names of attributes a batch must write before it
+    _attr_dependencies = {}
+    _multi_dev_parallel = False
+
+    @property
+    def attr_cache(self):
+        """ attr_cache: Read cache of the attribute helpers of this object,
+            or None when caching is disabled. See attr_cache_enable().
+        """
+        return self._attr_cache
+
+    def attr_cache_enable(self, default_ttl=1.0, policies=None):
+        """ Cache attribute reads of this object.
+
+            Reads through the _get_iio_* helpers return a cached value until
+            its lifetime ends. Writes through the _set_iio_* helpers drop
+            cached values. Attributes written directly through libiio are
+            not seen and may be returned stale for up to their lifetime.
+
+            Unique parameters:
+                default_ttl: type=float
+                    Lifetime in seconds of values not matched by a policy
+                policies: type=list of (str, float)
+                    Attribute name patterns, such as "*_available", and
+                    lifetimes in seconds. They take precedence over the
+                    defaults, which never expire *_available, name and
+                    label, keep sensor inputs for 0.1 s and never cache raw.
+
+            returns: type=attr_cache
+        """
+        self._attr_cache = attr_cache(default_ttl, policies)
+        return self._attr_cache
+
+    def attr_cache_disable(self):
+        """ Stop caching attribute reads and drop cached values """
+        self._attr_cache = None
+
+    @property
+    def multi_dev_parallel(self):
+        """ multi_dev_parallel: Access the devices of the *_multi_dev helpers
+            concurrently, one worker thread per IIO context. Devices sharing
+            a context are still accessed one after another.
+        """
+        return self._multi_dev_parallel
+
+    @multi_dev_parallel.setter
+    def multi_dev_parallel(self, value):
+        self._multi_dev_parallel = bool(value)
+
+    @contextmanager
+    def batch(self, dependencies=None):
+        """ Collect property writes and apply them when the block ends.
+
+            Repeated writes to an attribute are coalesced into the last one
+            and, with attr_cache_enable(), writes of the cached value are
+            dropped. Attributes listed in _attr_dependencies or dependencies
+            are written after the attributes they depend on. All writes are
+            attempted and failures are raised together as attr_batch_error.
+            Reads inside the block do not see the pending values, and writes
+            are discarded if the block raises. Nested batches join the outer
+            one.
+
+            Unique parameters:
+                dependencies: type=dict
+                    Attribute name to list of attribute names which must be
+                    written before it, in addition to _attr_dependencies
+
+            returns: type=attr_batch
+        """
+        if self._attr_batch is not None:
+            yield self._attr_batch
+            return
+        batch = attr_batch(self, dependencies)
+        self._attr_batch = batch
+        try:
+            yield batch
+        finally:
+            self._attr_batch = None
+        batch.flush()
+
+    def _attr_write(self, key, value):
+        """ Write value to the attribute identified by key, or queue it while
+            a batch is open. key holds the device, channel name, direction
+            and attribute name, with direction None for device attributes
+            and channel name "debug" for debug attributes.
+        """
+        if self._attr_batch is not None:
+            self._attr_batch._add(key, value)
+            return
+        dev, channel_name, output, attr_name = key
+        if output is not None:
+            find_channel(dev, channel_name, output).attrs[attr_name].value = value
+        elif channel_name == "debug":
+            dev.debug_attrs[attr_name].value = value
+        else:
+            dev.attrs[attr_name].value = value
+        self._iio_attr_written(attr_name)
+
+    def _iio_attr_written(self, attr_name):
+        """ Hook called after an attribute is written through the helpers.
+            Classes caching values derived from attributes override this
+            to invalidate them.
+        """
+        if self._attr_cache is not None:
+            self._attr_cache.invalidate(attr_name)
+
+    async def arun(self, func, *args, **kwargs):
+        """ Await func(*args, **kwargs) run on the thread serializing access
+            to this device's context. See adi.aio.
+        """
+        return await run_in_context(self, func, *args, **kwargs)
+
+    async def aget(self, name):
+        """ Await the value of the property name """
+        return await run_in_context(self, getattr, self, name)
+
+    async def aset(self, name, value):
+        """ Await setting the property name to value """
+        await run_in_context(self, setattr, self, name, value)
+
+    def _multi_dev_run(self, ctrls, func):
+        """ Call func(index, ctrl) for every ctrl and return the results in
+            order of ctrls. With multi_dev_parallel set, ctrls on different
+            contexts are handled concurrently on their context executors and
+            the first exception in order of ctrls is raised once all calls
+            ended. Calls run in the current thread inside a batch, from a
+            context worker or when all ctrls share one context.
+        """
+        ctrls = list(ctrls)
+        if (
+            self._multi_dev_parallel
+            and self._attr_batch is None
+            and not in_context_worker()
+        ):
+            executors = [context_executor(ctrl) for ctrl in ctrls]
+            if len({id(e) for e in executors}) > 1:
+                futures = [
+                    e.submit(func, i, ctrl)
+                    for i, (e, ctrl) in enumerate(zip(executors, ctrls))
+                ]
+                wait(futures)
+                return [f.result() for f in futures]
+        return [func(i, ctrl) for i, ctrl in enumerate(ctrls)]
+
     def _get_iio_attr_str_multi_dev(self, channel_names, attr_name, output, ctrls):
         """ Get the same channel attribute across multiple devices
             which are assumed to be strings
         """
         if not isinstance(channel_names, list):
             channel_names = [channel_names]
-        return {
-            ctrl.name: [
+        ctrls = list(ctrls)
+
+        def read(_, ctrl):
+            return [
                 self._get_iio_attr_str(chan_name, attr_name, output, ctrl)
                 for chan_name in channel_names
             ]
-            for ctrl in ctrls
-        }
+
+        values = self._multi_dev_run(ctrls, read)
+        return {ctrl.name: v for ctrl, v in zip(ctrls, values)}
 
     def _set_iio_attr_multi_dev(self, channel_names, attr_name, output, values, ctrls):
         """ Set the same channel attribute across multiple devices
@@ -38,12 +247,15 @@ class attribute:
         """
         if len(values) > len(ctrls) * len(channel_names):
             raise Exception("Too many values to write")
-        i = 0
-        for ctrl in ctrls:
+
+        def write(index, ctrl):
+            i = index * len(channel_names)
             for chan_name in channel_names:
                 self._set_iio_attr(chan_name, attr_name, output, values[i], ctrl)
                 i += 1
 
+        self._multi_dev_run(ctrls, write)
+
     def _set_iio_attr_float_multi_dev(
         self, channel_names, attr_name, output, values, ctrls
     ):
@@ -61,14 +273,9 @@ class attribute:
 
     def _set_iio_attr(self, channel_name, attr_name, output, value, _ctrl=None):
         """ Set channel attribute """
-        if _ctrl:
-            channel = _ctrl.find_channel(channel_name, output)
-        else:
-            channel = self._ctrl.find_channel(channel_name, output)
-        try:
-            channel.attrs[attr_name].value = str(value)
-        except Exception as ex:
-            raise ex
+        self._attr_write(
+            (_ctrl or self._ctrl, channel_name, output, attr_name), str(value)
+        )
 
     def _set_iio_attr_float(self, channel_name, attr_name, output, value, _ctrl=None):
         """ Set channel attribute with float """
@@ -113,10 +320,17 @@ class attribute:
 
     def _get_iio_attr_str(self, channel_name, attr_name, output, _ctrl=None):
         """ Get channel attribute as string """
-        if _ctrl:
-            channel = _ctrl.find_channel(channel_name, output)
-        else:
-            channel = self._ctrl.find_channel(channel_name, output)
+        if self._attr_cache is not None:
+            return self._attr_cache.get(
+                (_ctrl or self._ctrl, channel_name, output, attr_name),
+                lambda: self.__read_iio_attr_str(
+                    channel_name, attr_name, output, _ctrl
+                ),
+            )
+        return self.__read_iio_attr_str(channel_name, attr_name, output, _ctrl)
+
+    def __read_iio_attr_str(self, channel_name, attr_name, output, _ctrl):
+        channel = find_channel(_ctrl or self._ctrl, channel_name, output)
         if not channel:
             raise Exception("No channel found with name: " + channel_name)
         return channel.attrs[attr_name].value
@@ -145,16 +359,18 @@ class attribute:
 
     def _set_iio_dev_attr_str(self, attr_name, value, _ctrl=None):
         """ Set device attribute with string """
-        try:
-            if _ctrl:
-                _ctrl.attrs[attr_name].value = str(value)
-            else:
-                self._ctrl.attrs[attr_name].value = str(value)
-        except Exception as ex:
-            raise ex
+        self._attr_write((_ctrl or self._ctrl, None, None, attr_name), str(value))
 
     def _get_iio_dev_attr_str(self, attr_name, _ctrl=None):
         """ Get device attribute as string """
+        if self._attr_cache is not None:
+            return self._attr_cache.get(
+                (_ctrl or self._ctrl, None, None, attr_name),
+                lambda: self.__read_iio_dev_attr_str(attr_name, _ctrl),
+            )
+        return self.__read_iio_dev_attr_str(attr_name, _ctrl)
+
+    def __read_iio_dev_attr_str(self, attr_name, _ctrl):
         if _ctrl:
             return _ctrl.attrs[attr_name].value
         else:
@@ -162,11 +378,7 @@ class attribute:
 
     def _set_iio_dev_attr(self, attr_name, value, _ctrl=None):
         """ Set device attribute """
-        _dev = _ctrl or self._ctrl
-        try:
-            _dev.attrs[attr_name].value = str(value)
-        except Exception as ex:
-            raise ex
+        self._attr_write((_ctrl or self._ctrl, None, None, attr_name), str(value))
 
     def _get_iio_dev_attr(self, attr_name, _ctrl=None):
         """ Set device attribute as number """
@@ -174,16 +386,18 @@ class attribute:
 
     def _set_iio_debug_attr_str(self, attr_name, value, _ctrl=None):
         """ Set debug attribute with string """
-        try:
-            if _ctrl:
-                _ctrl.debug_attrs[attr_name].value = str(value)
-            else:
-                self._ctrl.debug_attrs[attr_name].value = str(value)
-        except Exception as ex:
-            raise ex
+        self._attr_write((_ctrl or self._ctrl, "debug", None, attr_name), str(value))
 
     def _get_iio_debug_attr_str(self, attr_name, _ctrl=None):
         """ Get debug attribute as string """
+        if self._attr_cache is not None:
+            return self._attr_cache.get(
+                (_ctrl or self._ctrl, "debug", None, attr_name),
+                lambda: self.__read_iio_debug_attr_str(attr_name, _ctrl),
+            )
+        return self.__read_iio_debug_attr_str(attr_name, _ctrl)
+
+    def __read_iio_debug_attr_str(self, attr_name, _ctrl):
         if _ctrl:
             return _ctrl.debug_attrs[attr_name].value
         else:
@@ -192,3 +406,95 @@ class attribute:
     def _get_iio_debug_attr(self, attr_name, _ctrl=None):
         """ Set debug attribute as number """
         return get_numbers(self._get_iio_debug_attr_str(attr_name, _ctrl))
+
+
+class IIOAttr(property):
+    """ Property reading and writing one IIO attribute.
+
+        Replaces hand written properties calling the _get_iio_* and
+        _set_iio_* helpers. Values are parsed by a parser chosen once for
+        the type instead of the general get_numbers() regular expression.
+        Reads and writes still go through the helpers of attribute, so the
+        attribute cache and batches apply.
+
+        Parameters:
+            channel: type=str or callable
+                Channel name, a function returning the channel name for an
+                object, or None for a device attribute
+            name: type=str
+                Attribute name
+            type: type=int, float, str or list
+                Value type. Lists are lists of floats. Setting an int
+                attribute requires an int, as _set_iio_attr_int() does.
+            output: type=bool
+                Output channel
+            ctrl: type=str
+                Name of the member holding the IIO device. Default: _ctrl
+            readonly: type=bool
+                Do not create a setter
+            doc: type=str
+                Docstring of the property
+    """
+
+    _parsers = {int: _parse_int, float: _parse_float, str: None, list: _parse_list}
+    _checks = {int: _check_int, float: _check_float}
+
+    def __init__(
+        self,
+        channel,
+        name,
+        type=float,
+        output=False,
+        ctrl=None,
+        readonly=False,
+        doc=None,
+    ):
+        if type not in self._parsers:
+            raise ValueError(f"Unsupported attribute type {type}")
+        self.channel = channel
+        self.name = name
+        self.type = type
+        self.output = output
+        self.ctrl = ctrl
+        parse = self._parsers[type]
+        check = self._checks.get(type)
+        fmt = {int: lambda v: str(int(v)), list: _format_list}.get(type, str)
+        read, write = self.__accessors(channel, name, output, ctrl)
+
+        if parse is None:
+            fget = read
+        else:
+
+            def fget(obj):
+                return parse(read(obj))
+
+        def fset(obj, value):
+            if check:
+                value = check(value)
+            write(obj, fmt(value))
+
+        super().__init__(fget, None if readonly else fset, None, doc)
+        # Older Pythons keep the class docstring on property subclasses
+        self.__doc__ = doc
+
+    @staticmethod
+    def __accessors(channel, name, output, ctrl):
+        def dev(obj):
+            return getattr(obj, ctrl) if ctrl else None
+
+        if channel is None:
+            return (
+                lambda obj: obj._get_iio_dev_attr_str(name, dev(obj)),
+                lambda obj, v: obj._set_iio_dev_attr(name, v, dev(obj)),
+            )
+        if callable(channel):
+            return (
+                lambda obj: obj._get_iio_attr_str(channel(obj), name, output, dev(obj)),
+                lambda obj, v: obj._set_iio_attr(
+                    channel(obj), name, output, v, dev(obj)
+                ),
+            )
+        return (
+            lambda obj: obj._get_iio_attr_str(channel, name, output, dev(obj)),
+            lambda obj, v: obj._set_iio_attr(channel, name, output, v, dev(obj)),
+        )
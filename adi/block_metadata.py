@@ -0,0 +1,61 @@
+# Copyright (C) 2026 Analog Devices, Inc.
+#
+# SPDX short identifier: ADIBSD
+
+from typing import Optional
+
+import numpy as np
+
+
+class block_metadata:
+    """Timing information of one buffer returned by rx() in metadata mode.
+
+    Attributes:
+        timestamp: Host time.monotonic() value when the refill completed
+        sample_index: Index of the first sample of the buffer, counted per
+            channel since the device was created or rx_destroy_buffer()
+            was last called
+        length: Number of samples per channel in the buffer
+        hw_timestamps: One hardware timestamp per sample, read from the
+            timestamp scan channel of the device, or None when the device
+            has no such channel. Units depend on the device, see its
+            current_timestamp_clock attribute.
+    """
+
+    __slots__ = ("timestamp", "sample_index", "length", "hw_timestamps")
+
+    def __init__(
+        self,
+        timestamp: float,
+        sample_index: int,
+        length: int,
+        hw_timestamps: Optional[np.ndarray] = None,
+    ):
+        self.timestamp = timestamp
+        self.sample_index = sample_index
+        self.length = length
+        self.hw_timestamps = hw_timestamps
+
+    @property
+    def sample_indexes(self) -> np.ndarray:
+        """sample_indexes: Cumulative index of every sample in the buffer"""
+        return np.arange(self.sample_index, self.sample_index + self.length)
+
+    def host_times(self, sample_rate: float) -> np.ndarray:
+        """Estimate the host time of every sample.
+
+        The last sample is assumed to be captured when the refill completed
+        and earlier samples are spaced by 1 / sample_rate. Together with
+        sample_indexes this can be passed to numpy.interp to align captures
+        with external events.
+        """
+        offsets = np.arange(self.length - 1, -1, -1, dtype=np.float64)
+        return self.timestamp - offsets / sample_rate
+
+    def __repr__(self):
+        hw = None if self.hw_timestamps is None else len(self.hw_timestamps)
+        return (
+            f"block_metadata(timestamp={self.timestamp}, "
+            f"sample_index={self.sample_index}, length={self.length}, "
+            f"hw_timestamps={hw})"
+        )
@@ -0,0 +1,91 @@
+# Copyright (C) 2026 Analog Devices, Inc.
+#
+# SPDX short identifier: ADIBSD
+
+
+class channel_table:
+    """Channels of one IIO device indexed by direction and identifier.
+
+    find_channel() of libiio compares the name against every channel of the
+    device on each call, which dominates attribute access on devices with
+    many channels and on remote contexts. The table is built once from the
+    channel list and answers lookups by id or name with a single dictionary
+    access. The first matching channel wins, as with find_channel().
+    Channel labels are indexed separately, on the first find_label() call.
+    """
+
+    def __init__(self, dev):
+        self._channels = ({}, {})
+        self._labels = None
+        self._all = []
+        for chan in dev.channels:
+            self._all.append(chan)
+            index = self._channels[bool(chan.output)]
+            for key in (chan.id, chan.name):
+                if isinstance(key, str):
+                    index.setdefault(key, chan)
+        self.count = len(self._all)
+
+    def find(self, name: str, output: bool = False):
+        """Channel with id or name equal to name, or None"""
+        return self._channels[bool(output)].get(name)
+
+    def find_label(self, label: str, output: bool = False):
+        """Channel with the given label, or None"""
+        if self._labels is None:
+            labels = ({}, {})
+            for chan in self._all:
+                try:
+                    value = chan.label
+                except (AttributeError, OSError):
+                    continue
+                if isinstance(value, str) and value:
+                    labels[bool(chan.output)].setdefault(value, chan)
+            self._labels = labels
+        return self._labels[bool(output)].get(label)
+
+    def __len__(self):
+        return self.count
+
+
+# Attribute of the device object holding its table, so the table lives
+# exactly as long as the device. A global registry would be kept alive
+# by its channels, which reference their device and context.
+_TABLE_ATTR = "_pyadi_channel_table"
+
+
+def lookup(dev) -> channel_table:
+    """Channel table of dev, built on first use"""
+    try:
+        table = vars(dev).get(_TABLE_ATTR)
+    except TypeError:
+        # Objects without a __dict__ cannot hold a table
+        return channel_table(dev)
+    if table is None:
+        table = channel_table(dev)
+        setattr(dev, _TABLE_ATTR, table)
+    return table
+
+
+def find_channel(dev, name: str, output: bool = False):
+    """Channel of dev with id or name equal to name, or None, as returned
+    by dev.find_channel. Names missing from the table are passed on to
+    dev.find_channel.
+    """
+    chan = lookup(dev).find(name, output)
+    if chan is None:
+        chan = dev.find_channel(name, output)
+    return chan
+
+
+def find_channel_by_label(dev, label: str, output: bool = False):
+    """Channel of dev with the given label, or None"""
+    return lookup(dev).find_label(label, output)
+
+
+def forget(dev):
+    """Drop the table of dev so it is built again on the next lookup"""
+    try:
+        vars(dev).pop(_TABLE_ATTR, None)
+    except TypeError:
+        pass
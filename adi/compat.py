@@ -3,11 +3,14 @@
 # SPDX short identifier: ADIBSD
 """Compatibility module for libiio v1.X."""
 
-from typing import List, Union
+import time
+from typing import List, Optional, Union
 
 import iio
 import numpy as np
 
+from adi.channel_table import find_channel
+
 
 def _is_libiio_v1() -> bool:
     """Check is we are using >= v1.X."""
@@ -15,31 +18,221 @@ def _is_libiio_v1() -> bool:
     return v[0] >= 1
 
 
+class _channel_descriptor:
+    """Data format of a buffer channel, read once per buffer configuration.
+
+    Attributes:
+        channel: iio.Channel handle
+        index: Scan index of the channel
+        length: Storage size of one sample in bits
+        bits: Number of valid bits in a sample
+        shift: Right shift applied to the stored sample
+        repeat: Number of values per sample
+        is_signed: Samples are signed
+        is_be: Samples are stored big endian
+        raw_dtype: numpy dtype of the stored samples, in device byte order
+        dtype: numpy dtype of the samples in host byte order
+    """
+
+    __slots__ = (
+        "channel",
+        "index",
+        "length",
+        "bits",
+        "shift",
+        "repeat",
+        "is_signed",
+        "is_be",
+        "raw_dtype",
+        "dtype",
+    )
+
+    def __init__(self, channel: iio.Channel):
+        df = channel.data_format
+        self.channel = channel
+        self.index = channel.index
+        self.length = df.length
+        self.bits = df.bits
+        self.shift = df.shift
+        self.repeat = df.repeat
+        self.is_signed = df.is_signed is True
+        self.is_be = bool(df.is_be)
+        fmt = ("i" if self.is_signed else "u") + str(df.length // 8)
+        self.dtype = np.dtype(fmt)
+        self.raw_dtype = self.dtype.newbyteorder(">" if self.is_be else "<")
+
+
+def _decode_samples(x: np.ndarray, bits: int, shift: int = 0, signed: bool = True):
+    """Extract bits valid bits starting at bit shift from each raw sample.
+
+    The field is moved to the least significant bits and either sign extended
+    or zero filled, using one left and one right shift of the whole array.
+    This covers partial width samples such as 24, 20 or 18 valid bits in a
+    32 bit word, and fields packed into a common word.
+
+    Args:
+        x: Raw samples as an integer array
+        bits: Number of valid bits in each sample
+        shift: Position of the least significant valid bit
+        signed: Sign extend the result instead of zero filling it
+
+    Returns:
+        Array with the same itemsize as x, signed if signed is True
+    """
+    length = x.dtype.itemsize * 8
+    if bits + shift > length:
+        raise ValueError(f"{bits} bits shifted by {shift} do not fit in {length}")
+    kind = "i" if signed else "u"
+    out_type = np.dtype(kind + str(x.dtype.itemsize))
+    if bits == length:
+        return x.astype(out_type, copy=False)
+    y = np.left_shift(x.astype(out_type), length - bits - shift)
+    np.right_shift(y, length - bits, out=y)
+    return y
+
+
+def _rx_sample_layout(descriptors: List[_channel_descriptor], sample_size: int):
+    """Describe one interleaved sample of a buffer as a structured dtype.
+
+    Channels are stored in scan index order, each aligned to its own storage
+    size, as done by libiio when computing the sample size. Channels which
+    can be viewed in place get a field named "c<n>" where n is their
+    position in descriptors. Channels with repeated samples get None and are
+    read with chan.read() instead, as are all channels when the computed
+    size differs from sample_size, since then other channels are enabled
+    and the offsets cannot be known.
+
+    Returns:
+        Tuple of the structured dtype (or None when no channel can be viewed)
+        and the list of field names matching descriptors
+    """
+    offsets = {}
+    size = 0
+    prev_index = None
+    for desc in sorted(descriptors, key=lambda d: d.index):
+        length = desc.length // 8 * desc.repeat
+        if prev_index is not None and desc.index == prev_index:
+            offsets[desc.index] = offsets[prev_index]
+            continue
+        if size % length:
+            size += length - (size % length)
+        offsets[desc.index] = size
+        size += length
+        prev_index = desc.index
+
+    names, formats, field_offsets, fields = [], [], [], []
+    for i, desc in enumerate(descriptors):
+        if desc.repeat != 1 or size != sample_size:
+            fields.append(None)
+            continue
+        names.append(f"c{i}")
+        formats.append(desc.raw_dtype)
+        field_offsets.append(offsets[desc.index])
+        fields.append(f"c{i}")
+
+    if not names:
+        return None, fields
+    dtype = np.dtype(
+        {
+            "names": names,
+            "formats": formats,
+            "offsets": field_offsets,
+            "itemsize": sample_size,
+        }
+    )
+    return dtype, fields
+
+
+def _rx_timestamp_channel(dev, name: Optional[str]):
+    """Timestamp scan channel name of dev, or None if it has none"""
+    if not name:
+        return None
+    chan = find_channel(dev, name)
+    if chan is None or not chan.scan_element:
+        return None
+    return chan
+
+
+def _rx_deinterleave(raw, descriptors: List[_channel_descriptor], layout, source):
+    """Split a raw interleaved buffer into per channel arrays in one pass.
+
+    Channels with a field in layout are returned as strided views into raw,
+    or decoded with _decode_samples() when they are shifted or partial width.
+    The remaining channels are converted by libiio through chan.read(source).
+    """
+    dtype, fields = layout
+    samples = np.frombuffer(raw, dtype=dtype) if dtype is not None else None
+    data_channel_interleaved = []
+    for desc, field in zip(descriptors, fields):
+        if field is None:
+            x = np.frombuffer(desc.channel.read(source), dtype=desc.dtype)
+        else:
+            x = samples[field]
+            if desc.is_be:
+                x = x.astype(desc.dtype)
+            if desc.shift or desc.bits != desc.length:
+                x = _decode_samples(x, desc.bits, desc.shift, desc.is_signed)
+        data_channel_interleaved.append(x)
+    return data_channel_interleaved
+
+
 class compat_libiio_v1_rx:
     """Compatibility class for libiio v1.X RX."""
 
     _rx_buffer_mask = None
     _rx_stream = None
-    _rx_buffer_num_blocks = 4
-
-    def _rx_init_channels(self):
-        if not self._rx_buffer_mask:
-            self._rx_buffer_mask = iio.ChannelsMask(self._rxadc)
+    _rx_layout = (None, [])
+    _rx_descriptors = []
+    _rx_buffer_key = None
+    _rx_timestamp_captured = False
+
+    def _rx_config_key(self):
+        return (
+            tuple(self.rx_enabled_channels),
+            self.rx_buffer_size,
+            self._rx_buffer_num_blocks,
+            self._rx_timestamp_enabled(),
+        )
 
+    def _rx_pool_entry_create(self):
         channels = []
         if self._complex_data:
             for m in self.rx_enabled_channels:
-                v = self._rxadc.find_channel(self._rx_channel_names[m * 2])
+                v = find_channel(self._rxadc, self._rx_channel_names[m * 2])
                 channels.append(v)
-                v = self._rxadc.find_channel(self._rx_channel_names[m * 2 + 1])
+                v = find_channel(self._rxadc, self._rx_channel_names[m * 2 + 1])
                 channels.append(v)
         else:
             for m in self.rx_enabled_channels:
-                v = self._rxadc.find_channel(self._rx_channel_names[m])
+                v = find_channel(self._rxadc, self._rx_channel_names[m])
                 channels.append(v)
+        # Captured last so it can be split off the returned channels
+        timestamp = _rx_timestamp_channel(self._rxadc, self._rx_timestamp_enabled())
+        if timestamp:
+            channels.append(timestamp)
+
+        mask = iio.ChannelsMask(self._rxadc)
+        mask.channels = channels
+        descriptors = [_channel_descriptor(v) for v in channels]
+        return {
+            "descriptors": descriptors,
+            "mask": mask,
+            "layout": _rx_sample_layout(descriptors, mask.sample_size),
+            "timestamp": timestamp is not None,
+        }
 
-        self._rx_buffer_mask.channels = channels
-
+    def _rx_init_channels(self):
+        if not self._rx_tuning_applied:
+            self._streaming_settings_apply("rx")
+        key = self._rx_config_key()
+        entry = self._rx_buffer_pool_get(key, self._rx_pool_entry_create)
+
+        # Only one stream can be open on the device buffer at a time
+        self._rx_stream = None
+        self._rx_buffer_mask = entry["mask"]
+        self._rx_descriptors = entry["descriptors"]
+        self._rx_layout = entry["layout"]
+        self._rx_timestamp_captured = entry["timestamp"]
         self._rxbuf = self._rxadc.get_buffer()
         self._rx_stream = iio.Stream(
             buffer=self._rxbuf,
@@ -47,22 +240,33 @@ class compat_libiio_v1_rx:
             samples_count=self.rx_buffer_size,
             nb_blocks=self._rx_buffer_num_blocks,
         )
+        self._rx_buffer_key = key
+
+    def rx_destroy_buffer(self):
+        """rx_destroy_buffer: Clears RX buffer"""
+        self._rx_stream = None
+        super().rx_destroy_buffer()
+
+    def _rx_buffer_cancel(self):
+        # iio.Buffer has no cancel(), refills block in the stream
+        stream = self._rx_stream
+        if stream is not None:
+            stream.cancel()
 
     def _rx_buffered_data(self):
-        if not self._rx_stream:
+        if not self._rx_stream or self._rx_buffer_key != self._rx_config_key():
             self._rx_init_channels()
 
+        started = time.monotonic()
         block = next(self._rx_stream)
+        self._rx_refilled(started)
 
-        data_channel_interleaved = []
-        for chan in self._rx_buffer_mask.channels:
-            bytearray_data = chan.read(block)
-            # create format strings
-            df = chan.data_format
-            fmt = ("i" if df.is_signed is True else "u") + str(df.length // 8)
-            data_channel_interleaved.append(np.frombuffer(bytearray_data, dtype=fmt))
-
-        return data_channel_interleaved
+        data = _rx_deinterleave(
+            block.read(), self._rx_descriptors, self._rx_layout, block
+        )
+        if self._rx_timestamp_captured:
+            self._rx_hw_timestamps = data.pop()
+        return data
 
 
 class compat_libiio_v1_tx:
@@ -70,27 +274,30 @@ class compat_libiio_v1_tx:
 
     _tx_buffer_mask = None
     _tx_stream = None
-    _tx_buffer_num_blocks = 4
     _tx_block = None
     _tx_buf_stream = None
+    _tx_descriptors = []
 
     def _tx_init_channels(self):
+        if not self._tx_tuning_applied:
+            self._streaming_settings_apply("tx")
         if not self._tx_buffer_mask:
             self._tx_buffer_mask = iio.ChannelsMask(self._txdac)
 
         channels = []
         if self._complex_data:
             for m in self.tx_enabled_channels:
-                v = self._txdac.find_channel(self._tx_channel_names[m * 2], True)
+                v = find_channel(self._txdac, self._tx_channel_names[m * 2], True)
                 channels.append(v)
-                v = self._txdac.find_channel(self._tx_channel_names[m * 2 + 1], True)
+                v = find_channel(self._txdac, self._tx_channel_names[m * 2 + 1], True)
                 channels.append(v)
         else:
             for m in self.tx_enabled_channels:
-                v = self._txdac.find_channel(self._tx_channel_names[m], True)
+                v = find_channel(self._txdac, self._tx_channel_names[m], True)
                 channels.append(v)
 
         self._tx_buffer_mask.channels = channels
+        self._tx_descriptors = [_channel_descriptor(v) for v in channels]
 
         self._txbuf = self._txdac.get_buffer()
         if not self._tx_cyclic_buffer:
@@ -121,24 +328,79 @@ class compat_libiio_v1_tx:
 class compat_libiio_v0_rx:
     """Compatibility class for libiio v0.X RX."""
 
-    def _rx_init_channels(self):
+    _rx_layout = (None, [])
+    _rx_descriptors = []
+    _rx_buffer_key = None
+    _rx_timestamp_captured = False
+
+    def _rx_config_key(self):
+        return (
+            tuple(self.rx_enabled_channels),
+            self.rx_buffer_size,
+            self._rx_buffer_num_blocks,
+            self._rx_timestamp_enabled(),
+        )
+
+    def _rx_pool_entry_create(self):
+        all_channels = []
         for m in self._rx_channel_names:
-            v = self._rxadc.find_channel(m)
+            v = find_channel(self._rxadc, m)
             if not v:
                 raise Exception(f"Channel {m} not found")
-            v.enabled = False
+            all_channels.append(v)
 
         if self._complex_data:
+            ecn = []
             for m in self.rx_enabled_channels:
-                v = self._rxadc.find_channel(self._rx_channel_names[m * 2])
-                v.enabled = True
-                v = self._rxadc.find_channel(self._rx_channel_names[m * 2 + 1])
-                v.enabled = True
+                ecn.extend(
+                    (self._rx_channel_names[m * 2], self._rx_channel_names[m * 2 + 1])
+                )
         else:
-            for m in self.rx_enabled_channels:
-                v = self._rxadc.find_channel(self._rx_channel_names[m])
-                v.enabled = True
+            ecn = [self._rx_channel_names[m] for m in self.rx_enabled_channels]
+        descriptors = [
+            _channel_descriptor(find_channel(self._rxadc, name)) for name in ecn
+        ]
+        # Disabled unless metadata mode captures it, last in descriptors
+        timestamp = _rx_timestamp_channel(self._rxadc, self._rx_timestamp_channel)
+        if timestamp:
+            all_channels.append(timestamp)
+            if self._rx_timestamp_enabled():
+                descriptors.append(_channel_descriptor(timestamp))
+            else:
+                timestamp = None
+        return {
+            "all_channels": all_channels,
+            "descriptors": descriptors,
+            "layout": None,
+            "timestamp": timestamp is not None,
+        }
+
+    def _rx_init_channels(self):
+        if not self._rx_tuning_applied:
+            self._streaming_settings_apply("rx")
+        key = self._rx_config_key()
+        entry = self._rx_buffer_pool_get(key, self._rx_pool_entry_create)
+
+        for v in entry["all_channels"]:
+            v.enabled = False
+        for desc in entry["descriptors"]:
+            desc.channel.enabled = True
+
+        # Release the previous buffer before the kernel buffer is reopened
+        self._rxbuf = None
+        self._rxadc.set_kernel_buffers_count(self._rx_buffer_num_blocks)
         self._rxbuf = iio.Buffer(self._rxadc, self._rx_buffer_size, False)
+        if entry["layout"] is None:
+            entry["layout"] = _rx_sample_layout(entry["descriptors"], self._rxbuf.step)
+        self._rx_descriptors = entry["descriptors"]
+        self._rx_layout = entry["layout"]
+        self._rx_timestamp_captured = entry["timestamp"]
+        self._rx_buffer_key = key
+
+    def _rx_buffer_cancel(self):
+        buf = self._rxbuf
+        if buf is not None:
+            buf.cancel()
 
     def _rx_buffered_data(self) -> Union[List[np.ndarray], np.ndarray]:
         """_rx_buffered_data: Read data from RX buffer
@@ -147,8 +409,9 @@ class compat_libiio_v0_rx:
             List of numpy arrays containing the data from the RX buffer that are
             channel interleaved
         """
-        if not self._rxbuf:
+        if not self._rxbuf or self._rx_buffer_key != self._rx_config_key():
             self._rx_init_channels()
+        started = time.monotonic()
         try:
             self._rxbuf.refill()
         except Exception:
@@ -168,48 +431,46 @@ class compat_libiio_v0_rx:
             del self._rxbuf
             self._rxbuf = None
             raise
+        self._rx_refilled(started)
 
-        data_channel_interleaved = []
-        ecn = []
-        if self._complex_data:
-            for m in self.rx_enabled_channels:
-                ecn.extend(
-                    (self._rx_channel_names[m * 2], self._rx_channel_names[m * 2 + 1])
-                )
-        else:
-            ecn = [self._rx_channel_names[m] for m in self.rx_enabled_channels]
-
-        for name in ecn:
-            chan = self._rxadc.find_channel(name)
-            bytearray_data = chan.read(self._rxbuf)  # Do local type conversion
-            # create format strings
-            df = chan.data_format
-            fmt = ("i" if df.is_signed is True else "u") + str(df.length // 8)
-            data_channel_interleaved.append(np.frombuffer(bytearray_data, dtype=fmt))
-
-        return data_channel_interleaved
+        data = _rx_deinterleave(
+            self._rxbuf.read(), self._rx_descriptors, self._rx_layout, self._rxbuf
+        )
+        if self._rx_timestamp_captured:
+            self._rx_hw_timestamps = data.pop()
+        return data
 
 
 class compat_libiio_v0_tx:
     """Compatibility class for libiio v0.X TX."""
 
+    _tx_descriptors = []
+
     def _tx_init_channels(self):
+        if not self._tx_tuning_applied:
+            self._streaming_settings_apply("tx")
         for m in self._tx_channel_names:
-            v = self._txdac.find_channel(m, True)
+            v = find_channel(self._txdac, m, True)
             if not v:
                 raise Exception(f"Channel {m} not found")
             v.enabled = False
 
+        channels = []
         if self._complex_data:
             for m in self.tx_enabled_channels:
-                v = self._txdac.find_channel(self._tx_channel_names[m * 2], True)
+                v = find_channel(self._txdac, self._tx_channel_names[m * 2], True)
                 v.enabled = True
-                v = self._txdac.find_channel(self._tx_channel_names[m * 2 + 1], True)
+                channels.append(v)
+                v = find_channel(self._txdac, self._tx_channel_names[m * 2 + 1], True)
                 v.enabled = True
+                channels.append(v)
         else:
             for m in self.tx_enabled_channels:
-                v = self._txdac.find_channel(self._tx_channel_names[m], True)
+                v = find_channel(self._txdac, self._tx_channel_names[m], True)
                 v.enabled = True
+                channels.append(v)
+        self._tx_descriptors = [_channel_descriptor(v) for v in channels]
+        self._txdac.set_kernel_buffers_count(self._tx_buffer_num_blocks)
         self._txbuf = iio.Buffer(
             self._txdac, self._tx_buffer_size, self._tx_cyclic_buffer
         )
@@ -0,0 +1,388 @@
+# Copyright (C) 2026 Analog Devices, Inc.
+#
+# SPDX short identifier: ADIBSD
+
+import json
+import mmap
+import os
+import queue
+import re
+import threading
+from typing import List, Optional
+
+import numpy as np
+
+_SIGMF_VERSION = "1.0.0"
+# Offset and size granularity of O_DIRECT writes
+_ALIGNMENT = 4096
+
+
+def _sigmf_datatype(dtype, complex_data: bool) -> str:
+    """SigMF core:datatype string for interleaved samples of dtype"""
+    dtype = np.dtype(dtype)
+    kinds = {"i": "i", "u": "u", "f": "f"}
+    if dtype.kind not in kinds:
+        raise ValueError(f"Unsupported sample type {dtype}")
+    name = ("c" if complex_data else "r") + kinds[dtype.kind]
+    name += str(dtype.itemsize * 8)
+    if dtype.itemsize > 1:
+        big = dtype.byteorder == ">" or (
+            dtype.byteorder == "=" and not np.little_endian
+        )
+        name += "_be" if big else "_le"
+    return name
+
+
+def _sigmf_dtype(datatype: str):
+    """numpy dtype of one I or Q component for a SigMF core:datatype string.
+
+    Returns a (dtype, complex_data) tuple.
+    """
+    m = re.fullmatch(r"([cr])([fiu])(8|16|32|64)(_le|_be)?", datatype)
+    if not m:
+        raise ValueError(f"Unsupported SigMF datatype {datatype}")
+    order = {"_le": "<", "_be": ">", None: "|"}[m.group(4)]
+    dtype = np.dtype(f"{order}{m.group(2)}{int(m.group(3)) // 8}")
+    return dtype, m.group(1) == "c"
+
+
+def _sigmf_read_meta(path: str) -> Optional[dict]:
+    """Global section of the SigMF metadata next to path, if there is one"""
+    meta_path = _sigmf_meta_path(path)
+    if not os.path.exists(meta_path):
+        return None
+    with open(meta_path) as f:
+        return json.load(f).get("global", {})
+
+
+def _sigmf_meta_path(path: str) -> str:
+    """Sidecar metadata file belonging to the data file path"""
+    return os.path.splitext(path)[0] + ".sigmf-meta"
+
+
+def _aligned_empty(shape, dtype, alignment: int = _ALIGNMENT) -> np.ndarray:
+    """Allocate an array whose data starts on an alignment boundary"""
+    dtype = np.dtype(dtype)
+    nbytes = int(np.prod(shape)) * dtype.itemsize
+    raw = np.empty(nbytes + alignment, dtype=np.uint8)
+    offset = -raw.ctypes.data % alignment
+    return raw[offset : offset + nbytes].view(dtype).reshape(shape)
+
+
+class file_sink:
+    """Write interleaved sample buffers to a raw file.
+
+    The file handle stays open between writes and buffers are written
+    directly from their memory. With background set, buffers are copied
+    into a pool of queue_size preallocated arrays and written by a separate
+    thread. The caller waits when the pool is exhausted, or with
+    drop_when_full the buffer is discarded and counted in dropped instead.
+
+    With direct set, data is collected in an aligned staging buffer and
+    written in multiples of 4096 bytes, with O_DIRECT where the platform and
+    file system support it, so long recordings bypass the page cache.
+
+    A SigMF metadata file holding the sample type, channel names and sample
+    rate is written next to the data file, so recordings can be memory
+    mapped back later with numpy.memmap or any SigMF reader.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        dtype,
+        channel_names: List[str],
+        complex_data: bool = False,
+        sample_rate: Optional[float] = None,
+        append: bool = False,
+        background: bool = False,
+        queue_size: int = 8,
+        metadata: Optional[dict] = None,
+        capture: Optional[dict] = None,
+        drop_when_full: bool = False,
+        direct: bool = False,
+        write_size: int = 1 << 20,
+    ):
+        if direct and append:
+            raise ValueError("direct writes cannot append to an existing file")
+        self.path = path
+        self.meta_path = _sigmf_meta_path(path)
+        self.dtype = np.dtype(dtype)
+        self.bytes_written = 0
+        self.dropped = 0
+
+        n = len(channel_names) // 2 if complex_data else len(channel_names)
+        meta_global = {
+            "core:datatype": _sigmf_datatype(self.dtype, complex_data),
+            "core:version": _SIGMF_VERSION,
+            "core:num_channels": n,
+            "adi:channel_names": list(channel_names),
+            "adi:dtype": self.dtype.str,
+        }
+        if sample_rate:
+            meta_global["core:sample_rate"] = float(sample_rate)
+        if metadata:
+            meta_global.update(metadata)
+        meta = {
+            "global": meta_global,
+            "captures": [dict({"core:sample_start": 0}, **(capture or {}))],
+            "annotations": [],
+        }
+        with open(self.meta_path, "w") as f:
+            json.dump(meta, f, indent=2)
+
+        self._stage = None
+        if direct:
+            self._file = self._open_direct(path)
+            size = max(write_size // _ALIGNMENT, 1) * _ALIGNMENT
+            self._stage = _aligned_empty(size, np.uint8)
+            self._staged = 0
+        else:
+            self._file = open(path, "ab" if append else "wb")
+
+        self._scratch = None
+        self._pending = None
+        self._free = None
+        self._drop = drop_when_full
+        self._error = None
+        self._worker = None
+        if background:
+            if queue_size < 1:
+                raise ValueError("queue_size must be at least 1")
+            self._pending = queue.Queue()
+            self._free = queue.Queue()
+            self._free_count = queue_size
+            self._worker = threading.Thread(
+                target=self._write_loop, name="file_sink", daemon=True
+            )
+            self._worker.start()
+
+    @staticmethod
+    def _open_direct(path: str):
+        flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0)
+        try:
+            fd = os.open(path, flags | getattr(os, "O_DIRECT", 0), 0o644)
+        except OSError:
+            # Some file systems, such as tmpfs, reject O_DIRECT
+            fd = os.open(path, flags, 0o644)
+        return open(fd, "wb", buffering=0)
+
+    def write(self, data: np.ndarray) -> bool:
+        """Append a buffer to the file.
+
+        args:
+            data: type=numpy.array
+                Interleaved samples. In background mode data is copied, so
+                the caller may reuse it once write returns.
+
+        returns: type=bool
+            False when the buffer was dropped because the pool was full.
+        """
+        self._check()
+        if not self._worker:
+            self._write_bytes(np.ascontiguousarray(data))
+            return True
+        buf = self._acquire(data.shape, data.dtype)
+        if buf is None:
+            return False
+        np.copyto(buf, data)
+        self._pending.put(buf)
+        return True
+
+    def write_channels(self, channels: List[np.ndarray]) -> bool:
+        """Interleave per channel arrays and append them to the file.
+
+        The samples are copied straight into a pooled buffer, so no
+        intermediate interleaved array is created.
+
+        args:
+            channels: type=list of numpy.array
+                One array per channel, all of the same length.
+
+        returns: type=bool
+            False when the buffer was dropped because the pool was full.
+        """
+        self._check()
+        shape = (len(channels[0]), len(channels))
+        if self._worker:
+            buf = self._acquire(shape, self.dtype)
+            if buf is None:
+                return False
+        else:
+            if self._scratch is None or self._scratch.shape != shape:
+                self._scratch = _aligned_empty(shape, self.dtype)
+            buf = self._scratch
+        for i, x in enumerate(channels):
+            np.copyto(buf[:, i], x, casting="unsafe")
+        if self._worker:
+            self._pending.put(buf)
+        else:
+            self._write_bytes(buf)
+        return True
+
+    def flush(self):
+        """Wait for queued buffers and flush them to the operating system.
+        With direct writes, a partially filled staging buffer is kept until
+        close().
+        """
+        if self._worker:
+            self._pending.join()
+        self._check()
+        self._file.flush()
+
+    def close(self):
+        """Write remaining buffers and close the file"""
+        if self._file.closed:
+            return
+        try:
+            if self._worker:
+                self._pending.put(None)
+                self._worker.join()
+                self._worker = None
+            self._check()
+            if self._stage is not None and self._staged:
+                # Pad the last write to the alignment, then cut the padding
+                padded = -(-self._staged // _ALIGNMENT) * _ALIGNMENT
+                self._stage[self._staged : padded] = 0
+                self._file.write(self._stage[:padded])
+                self._file.truncate(self.bytes_written)
+                self._staged = 0
+        finally:
+            self._file.close()
+
+    def _acquire(self, shape, dtype):
+        """Take a buffer from the pool, or None when dropping"""
+        try:
+            buf = self._free.get_nowait()
+        except queue.Empty:
+            if self._free_count > 0:
+                self._free_count -= 1
+                buf = None
+            elif self._drop:
+                self.dropped += 1
+                return None
+            else:
+                # Pool exhausted, wait for the writer to release a buffer
+                buf = self._free.get()
+        if buf is None or buf.shape != shape or buf.dtype != dtype:
+            buf = _aligned_empty(shape, dtype)
+        return buf
+
+    def _write_bytes(self, buf: np.ndarray):
+        if self._stage is None:
+            self._file.write(buf)
+            self.bytes_written += buf.nbytes
+            return
+        src = buf.reshape(-1).view(np.uint8)
+        while len(src):
+            n = min(len(src), len(self._stage) - self._staged)
+            self._stage[self._staged : self._staged + n] = src[:n]
+            self._staged += n
+            src = src[n:]
+            if self._staged == len(self._stage):
+                self._file.write(self._stage)
+                self._staged = 0
+        self.bytes_written += buf.nbytes
+
+    def _check(self):
+        if self._error:
+            ex, self._error = self._error, None
+            raise ex
+
+    def _write_loop(self):
+        while True:
+            buf = self._pending.get()
+            try:
+                if buf is None:
+                    return
+                if not self._error:
+                    self._write_bytes(buf)
+            except Exception as ex:  # noqa: BLE001
+                # Hand write errors over to the caller
+                self._error = ex
+            finally:
+                if buf is not None:
+                    self._free.put(buf)
+                self._pending.task_done()
+
+
+class file_source:
+    """Read interleaved sample buffers from a memory mapped raw file.
+
+    Chunks are copied out of the mapping into caller owned arrays. Pages are
+    released again once read, so resident memory stays at roughly one chunk
+    no matter how large the file is. The file is read frame by frame, where
+    a frame holds one sample of every channel, and can wrap around to the
+    start for seamless looping.
+
+    When a SigMF metadata file exists next to path, the sample type is taken
+    from it, otherwise dtype must be given.
+    """
+
+    def __init__(self, path: str, frame: int, dtype=None):
+        self.meta = _sigmf_read_meta(path) or {}
+        if "adi:dtype" in self.meta:
+            dtype = np.dtype(self.meta["adi:dtype"])
+        elif "core:datatype" in self.meta:
+            dtype = _sigmf_dtype(self.meta["core:datatype"])[0]
+        if dtype is None:
+            raise Exception(f"No metadata found for {path}, dtype must be given")
+        self.dtype = np.dtype(dtype)
+
+        self._file = open(path, "rb")
+        size = os.fstat(self._file.fileno()).st_size
+        # Ignore a trailing partial frame so looping keeps channels aligned
+        self.length = size // self.dtype.itemsize // frame * frame
+        if not self.length:
+            self._file.close()
+            raise Exception(f"{path} holds less than one frame of samples")
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        if hasattr(mmap, "MADV_SEQUENTIAL"):
+            self._mmap.madvise(mmap.MADV_SEQUENTIAL)
+        self._data = np.frombuffer(self._mmap, dtype=self.dtype, count=self.length)
+
+    def read_into(self, out: np.ndarray, position: int, loop: bool = False):
+        """Copy samples starting at position into out.
+
+        args:
+            out: type=numpy.array
+                1-D array receiving interleaved samples.
+            position: type=int
+                Sample offset to read from.
+            loop: type=bool
+                Continue from the start of the file when the end is reached.
+                Otherwise the remainder of out is filled with zeros.
+
+        returns: type=tuple
+            Position after the last sample read and number of samples read.
+        """
+        filled = 0
+        while filled < len(out):
+            if position >= self.length:
+                if not loop:
+                    out[filled:] = 0
+                    break
+                position = 0
+            n = min(len(out) - filled, self.length - position)
+            out[filled : filled + n] = self._data[position : position + n]
+            self._release(position, n)
+            filled += n
+            position += n
+        return position, filled
+
+    def _release(self, position: int, n: int):
+        """Drop fully read pages from the process"""
+        if not hasattr(mmap, "MADV_DONTNEED"):
+            return
+        start = position * self.dtype.itemsize // mmap.PAGESIZE * mmap.PAGESIZE
+        end = (position + n) * self.dtype.itemsize // mmap.PAGESIZE * mmap.PAGESIZE
+        if end > start:
+            self._mmap.madvise(mmap.MADV_DONTNEED, start, end - start)
+
+    def close(self):
+        """Unmap and close the file"""
+        if self._file.closed:
+            return
+        self._data = None
+        self._mmap.close()
+        self._file.close()
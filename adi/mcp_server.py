@@ -18,6 +18,8 @@ from typing import Dict, Optional
 import numpy as np
 from fastmcp import FastMCP
 
+from adi.aio import run_in_context
+
 logger = logging.getLogger(__name__)
 
 mcp = FastMCP("pyadi-iio")
@@ -322,7 +324,7 @@ async def get_property(connection_id: str, property_name: str) -> str:
         def _read():
             return getattr(device, property_name)
 
-        value = await asyncio.to_thread(_read)
+        value = await run_in_context(device, _read)
         return _success(property=property_name, value=_serialize_value(value),)
     except Exception as e:
         return _error(str(e))
@@ -363,7 +365,7 @@ async def set_property(connection_id: str, property_name: str, value: str,) -> s
                 return getattr(device, property_name)
             return parsed_value
 
-        confirmed = await asyncio.to_thread(_write)
+        confirmed = await run_in_context(device, _write)
         return _success(
             property=property_name,
             value=_serialize_value(confirmed),
@@ -412,7 +414,7 @@ async def capture_rx_data(
             dtype = str(data.dtype) if hasattr(data, "dtype") else "unknown"
             return {"shape": str(shape), "dtype": dtype}
 
-        meta = await asyncio.to_thread(_capture)
+        meta = await run_in_context(device, _capture)
         return _success(
             npy_path=output_path,
             buffer_size=buffer_size,
@@ -454,7 +456,7 @@ async def configure_dds(
                 "channel": channel,
             }
 
-        configured = await asyncio.to_thread(_configure_dds)
+        configured = await run_in_context(device, _configure_dds)
         dds_msg = f"DDS single tone configured: {frequency} Hz, scale {scale}, channel {channel}"
         return _success(configured=configured, message=dds_msg)
     except Exception as e:
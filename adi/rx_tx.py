@@ -2,16 +2,29 @@
 #
 # SPDX short identifier: ADIBSD
 
+import itertools
+import queue
+import threading
+import time
 from abc import ABCMeta, abstractmethod
-from typing import List, Union
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import List, Optional, Union
 
 import iio
 import numpy as np
 
 import adi.compat as cl
+from adi.aio import context_executor, run_in_context
 from adi.attribute import attribute
+from adi.block_metadata import block_metadata
+from adi.channel_table import find_channel
 from adi.context_manager import context_manager
 from adi.dds import dds
+from adi.file_io import file_sink, file_source
+from adi.sampler import unbuffered_sampler
+from adi.stream_stats import stream_stats
+from adi.tuning import load_settings
 
 if cl._is_libiio_v1():
     from adi.compat import compat_libiio_v1_rx as crx
@@ -20,6 +33,66 @@ else:
     from adi.compat import compat_libiio_v0_rx as crx
     from adi.compat import compat_libiio_v0_tx as ctx
 
+# Marks the end of an rx_stream() when n_buffers have been delivered
+_rx_stream_end = object()
+
+
+def _iq_pair_view(i: np.ndarray, q: np.ndarray):
+    """View adjacent I and Q samples as a single (N, 2) array.
+
+    Returns None unless q directly follows i in memory with the same dtype
+    and stride, as is the case for I/Q channels deinterleaved from a buffer.
+    """
+    if (
+        i.ndim != 1
+        or i.shape != q.shape
+        or i.dtype != q.dtype
+        or i.strides != q.strides
+    ):
+        return None
+    i_addr = i.__array_interface__["data"][0]
+    q_addr = q.__array_interface__["data"][0]
+    if q_addr - i_addr != i.itemsize:
+        return None
+    return np.lib.stride_tricks.as_strided(
+        i, shape=(len(i), 2), strides=(i.strides[0], i.itemsize), writeable=False
+    )
+
+
+def _iq_to_complex(i: np.ndarray, q: np.ndarray, dtype, out=None) -> np.ndarray:
+    """Combine I and Q arrays into complex samples of the given dtype.
+
+    Adjacent floating point I/Q samples of the matching precision are
+    returned as a view without copying. Otherwise the output is filled in
+    a single pass without intermediate arrays.
+    """
+    dtype = np.dtype(dtype)
+    pair = _iq_pair_view(i, q)
+    if out is None:
+        if pair is not None and pair.dtype == np.finfo(dtype).dtype:
+            try:
+                return pair.view(dtype)[:, 0]
+            except ValueError:
+                pass
+        out = np.empty(len(i), dtype=dtype)
+    if pair is not None and out.flags.c_contiguous:
+        np.copyto(out.view(out.real.dtype).reshape(-1, 2), pair, casting="unsafe")
+    else:
+        np.copyto(out.real, i, casting="unsafe")
+        np.copyto(out.imag, q, casting="unsafe")
+    return out
+
+
+def _iq_pack(out: np.ndarray, x: np.ndarray):
+    """Write complex samples x into the (N, 2) I/Q array out in one pass"""
+    x = np.asarray(x)
+    if np.iscomplexobj(x):
+        x = np.ascontiguousarray(x)
+        np.copyto(out, x.view(x.real.dtype).reshape(-1, 2), casting="unsafe")
+    else:
+        np.copyto(out[:, 0], x, casting="unsafe")
+        out[:, 1] = 0
+
 
 def are_channels_complex(channels: Union[List[str], List[iio.Channel]]) -> bool:
     """Check if channels are complex or not
@@ -50,6 +123,50 @@ class rx_tx_common(attribute):
     def _annotate(self, data, cnames: List[str], echans: List[int]):
         return {cnames[ec]: data[i] for i, ec in enumerate(echans)}
 
+    def _streaming_settings_apply(self, direction: str):
+        """Use the block count found by adi.tuning.tune_streaming() for this
+        device class and URI type, unless one was set on the instance.
+        Called by the compat layer before the first buffer is created.
+        """
+        setattr(self, f"_{direction}_tuning_applied", True)
+        attr = f"_{direction}_buffer_num_blocks"
+        if attr in self.__dict__:
+            return
+        settings = load_settings(self)
+        blocks = settings.get(f"{direction}_blocks") if settings else None
+        if blocks:
+            setattr(self, attr, int(blocks))
+
+    def _status_flag(self, dev, reg, mask):
+        """Read and clear the bits in mask of a converter status register.
+
+        The status bits are write-1-to-clear. Returns whether any of them
+        was set, or None when the register cannot be accessed.
+        """
+        try:
+            value = dev.reg_read(reg)
+            if not value & mask:
+                return False
+            dev.reg_write(reg, value & mask)
+        except Exception:  # noqa: BLE001
+            return None
+        return True
+
+    def _first_property(self, names):
+        """Value of the first property in names which reads as a number, used
+        to describe recordings. Returns None when none of them does.
+        """
+        for name in names:
+            try:
+                value = getattr(self, name, None)
+            except Exception:  # noqa: BLE001
+                continue
+            if isinstance(value, (int, float, np.number)) and not isinstance(
+                value, bool
+            ):
+                return value
+        return None
+
 
 class rx_core(rx_tx_common, metaclass=ABCMeta):
     """Buffer handling for receive devices"""
@@ -62,12 +179,46 @@ class rx_core(rx_tx_common, metaclass=ABCMeta):
     _rx_data_si_type = np.int16
     _rx_shift = 0
     _rx_buffer_size = 1024
+    # Number of blocks (kernel buffers) the RX buffer is split into
+    _rx_buffer_num_blocks = 4
     __rx_enabled_channels = [0]
     _rx_output_type = "raw"
     _rxbuf = None
     _rx_unbuffered_data = False
+    # Sampling rate of unbuffered captures in Hz, None reads as fast as possible
+    _rx_unbuffered_rate = None
+    _rx_unbuffered_timestamps = None
+    _rx_sampler = None
     _rx_annotated = False
     _rx_stack_interleaved = True  # Convert from channel to sample interleaved
+    _rx_stream_gaps = 0
+    _rx_record_dropped = 0
+    # Converter status register and RX overflow bit checked after refills
+    _rx_status_reg = 0x80000088
+    _rx_overflow_mask = 0x4
+    _rx_overflow_check = False
+    _rx_stats = None
+    _rx_stream_callback = None
+    # Return block_metadata alongside the data from rx()
+    _rx_metadata = False
+    # Scan channel holding hardware timestamps, captured in metadata mode
+    _rx_timestamp_channel = "timestamp"
+    _rx_hw_timestamps = None
+    _rx_sample_count = 0
+    _rx_last_block = None
+    _rx_tuning_applied = False
+    # Initialized buffer configurations, most recently used last
+    _rx_buffer_pool = None
+    _rx_buffer_pool_size = 4
+    # (enabled channels, scales, offsets) used for SI conversion
+    _rx_si_cache = None
+    # Writes to attributes containing these invalidate _rx_si_cache
+    _rx_si_attr_keys = ("scale", "offset", "range")
+    # Complex output type, None selects complex64 for samples up to 16 bits
+    _rx_complex_dtype = None
+    # Vectorized shift, mask and sign-extension for drivers post-processing
+    # raw samples, see adi.compat._decode_samples
+    _rx_decode = staticmethod(cl._decode_samples)
 
     def __init__(self, rx_buffer_size=1024):
         N = 2 if self._complex_data else 1
@@ -101,6 +252,35 @@ class rx_core(rx_tx_common, metaclass=ABCMeta):
         """rx_annotated: Set output data from rx() to be annotated"""
         self._rx_annotated = bool(value)
 
+    @property
+    def rx_complex_dtype(self):
+        """rx_complex_dtype: Data type of complex data returned by rx().
+        When None, numpy.complex64 is used for converters with float32 or
+        integer samples up to 16 bits and numpy.complex128 otherwise.
+        """
+        return self._rx_complex_dtype
+
+    @rx_complex_dtype.setter
+    def rx_complex_dtype(self, value):
+        """rx_complex_dtype: Data type of complex data returned by rx()"""
+        if value is not None:
+            value = np.dtype(value)
+            if value not in (np.complex64, np.complex128):
+                raise ValueError(
+                    f"Invalid rx_complex_dtype: {value}. Must be complex64 or complex128"
+                )
+        self._rx_complex_dtype = value
+
+    def __rx_complex_out_dtype(self, component: np.ndarray):
+        if self._rx_complex_dtype is not None:
+            return self._rx_complex_dtype
+        # complex64 holds float32 and integers up to 16 bits exactly
+        if component.dtype.kind == "f":
+            exact = component.itemsize <= 4
+        else:
+            exact = component.itemsize <= 2
+        return np.complex64 if exact else np.complex128
+
     @property
     def rx_output_type(self) -> str:
         """rx_output_type: Set output data type from rx()"""
@@ -113,6 +293,139 @@ class rx_core(rx_tx_common, metaclass=ABCMeta):
             raise ValueError(f"Invalid rx_output_type: {value}. Must be raw or SI")
         self._rx_output_type = value
 
+    @property
+    def rx_stream_gaps(self) -> int:
+        """rx_stream_gaps: Number of buffers discarded by the last rx_stream()
+        because the consumer did not keep up with the refill thread
+        """
+        return self._rx_stream_gaps
+
+    @property
+    def rx_stream_stats(self) -> stream_stats:
+        """rx_stream_stats: Buffer, sample, latency and overflow counters of
+        received buffers. Call reset() on it to start counting again.
+        """
+        if self._rx_stats is None:
+            self._rx_stats = stream_stats()
+        return self._rx_stats
+
+    @property
+    def rx_overflow_check(self) -> bool:
+        """rx_overflow_check: Read the ADC status register after every refill
+        and count overflows in rx_stream_stats. Each check is a register
+        access, so it is disabled by default.
+        """
+        return self._rx_overflow_check
+
+    @rx_overflow_check.setter
+    def rx_overflow_check(self, value: bool):
+        if value and self._rxadc:
+            # Clear flags left over from before monitoring started
+            self._status_flag(self._rxadc, self._rx_status_reg, self._rx_overflow_mask)
+        self._rx_overflow_check = bool(value)
+
+    @property
+    def rx_stream_callback(self):
+        """rx_stream_callback: Function called with rx_stream_stats when an
+        overflow is detected. It runs on the thread receiving the buffer.
+        """
+        return self._rx_stream_callback
+
+    @rx_stream_callback.setter
+    def rx_stream_callback(self, value):
+        self._rx_stream_callback = value
+
+    def _rx_refilled(self, started: float):
+        """Update rx_stream_stats after the compat layer received a buffer.
+
+        started is the time.monotonic() value before the refill.
+        """
+        now = time.monotonic()
+        stats = self.rx_stream_stats
+        stats._record(self.rx_buffer_size, now - started)
+        self._rx_block_received(self.rx_buffer_size, now)
+        if not self._rx_overflow_check:
+            return
+        flag = self._status_flag(
+            self._rxadc, self._rx_status_reg, self._rx_overflow_mask
+        )
+        if flag is None:
+            stats.status_available = False
+            self._rx_overflow_check = False
+        elif flag:
+            stats.overflows += 1
+            if self._rx_stream_callback:
+                self._rx_stream_callback(stats)
+
+    def _rx_block_received(self, samples: int, timestamp: float):
+        self._rx_last_block = (timestamp, self._rx_sample_count, samples)
+        self._rx_sample_count += samples
+
+    @property
+    def rx_metadata(self) -> bool:
+        """rx_metadata: When True, rx() returns a tuple of the data and a
+        block_metadata object holding the host time at which the refill
+        completed, the cumulative index of the first sample and, on devices
+        with a timestamp scan channel, the hardware timestamp of each sample.
+        """
+        return self._rx_metadata
+
+    @rx_metadata.setter
+    def rx_metadata(self, value: bool):
+        self._rx_metadata = bool(value)
+
+    def _rx_timestamp_enabled(self) -> Optional[str]:
+        """Name of the timestamp channel to capture, or None"""
+        if not self._rx_metadata or not self._rx_timestamp_channel:
+            return None
+        if self._rx_timestamp_channel in self._rx_channel_names:
+            # Already captured as a regular channel
+            return None
+        return self._rx_timestamp_channel
+
+    def __rx_block_metadata(self) -> block_metadata:
+        timestamp, index, length = self._rx_last_block
+        return block_metadata(timestamp, index, length, self._rx_hw_timestamps)
+
+    @property
+    def rx_record_dropped(self) -> int:
+        """rx_record_dropped: Number of buffers discarded by the last
+        rx_record() because the writer thread did not keep up
+        """
+        return self._rx_record_dropped
+
+    @property
+    def rx_unbuffered_rate(self):
+        """rx_unbuffered_rate: Sampling rate in samples per second used by
+        rx() on devices without buffer support. Each sample reads all enabled
+        channels. When None, samples are read as fast as possible.
+        """
+        return self._rx_unbuffered_rate
+
+    @rx_unbuffered_rate.setter
+    def rx_unbuffered_rate(self, value):
+        if value is not None and value <= 0:
+            raise ValueError("rx_unbuffered_rate must be positive or None")
+        self._rx_unbuffered_rate = value
+
+    @property
+    def rx_unbuffered_timestamps(self):
+        """rx_unbuffered_timestamps: Host time.monotonic() value of each sample
+        of the last capture on devices without buffer support
+        """
+        return self._rx_unbuffered_timestamps
+
+    @property
+    def rx_unbuffered_stats(self) -> dict:
+        """rx_unbuffered_stats: Achieved sampling rate in samples per second
+        and jitter (standard deviation of the sample interval in seconds) of
+        the last capture on devices without buffer support
+        """
+        if self._rx_sampler is None:
+            return {"rate": None, "jitter": None}
+        sampler = self._rx_sampler[1]
+        return {"rate": sampler.achieved_rate, "jitter": sampler.jitter}
+
     @property
     def rx_buffer_size(self):
         """rx_buffer_size: Size of receive buffer in samples"""
@@ -122,6 +435,22 @@ class rx_core(rx_tx_common, metaclass=ABCMeta):
     def rx_buffer_size(self, value):
         self._rx_buffer_size = value
 
+    @property
+    def rx_kernel_buffers(self) -> int:
+        """rx_kernel_buffers: Number of blocks of rx_buffer_size samples the
+        hardware fills ahead of rx(). More blocks absorb longer processing
+        delays at the cost of memory. Used as the number of stream blocks
+        with libiio v1 and as the kernel buffer count with libiio v0. Takes
+        effect when the buffer is next created.
+        """
+        return self._rx_buffer_num_blocks
+
+    @rx_kernel_buffers.setter
+    def rx_kernel_buffers(self, value: int):
+        if int(value) < 1:
+            raise ValueError("rx_kernel_buffers must be at least 1")
+        self._rx_buffer_num_blocks = int(value)
+
     @property
     def rx_enabled_channels(self) -> Union[List[int], List[str]]:
         """rx_enabled_channels: List of enabled channels (channel 1 is 0)
@@ -175,9 +504,51 @@ class rx_core(rx_tx_common, metaclass=ABCMeta):
     def _num_rx_channels_enabled(self):
         return len(self.__rx_enabled_channels)
 
+    @property
+    def rx_buffer_pool_size(self) -> int:
+        """rx_buffer_pool_size: Number of RX buffer configurations kept
+        initialized. A configuration is the combination of enabled channels,
+        buffer size and number of blocks. Switching back to a configuration
+        in the pool reuses its channel handles, channel mask and sample
+        layout instead of rebuilding them.
+        """
+        return self._rx_buffer_pool_size
+
+    @rx_buffer_pool_size.setter
+    def rx_buffer_pool_size(self, value: int):
+        if value < 1:
+            raise ValueError("rx_buffer_pool_size must be at least 1")
+        self._rx_buffer_pool_size = value
+        if self._rx_buffer_pool:
+            while len(self._rx_buffer_pool) > value:
+                self._rx_buffer_pool.popitem(last=False)
+
+    def rx_buffer_pool_clear(self):
+        """rx_buffer_pool_clear: Evict all cached RX buffer configurations"""
+        self._rx_buffer_pool = None
+
+    def _rx_buffer_pool_get(self, key, create):
+        """Get the pool entry for a buffer configuration, creating it with
+        create() if needed and evicting the least recently used entries
+        beyond rx_buffer_pool_size.
+        """
+        if self._rx_buffer_pool is None:
+            self._rx_buffer_pool = OrderedDict()
+        pool = self._rx_buffer_pool
+        if key in pool:
+            pool.move_to_end(key)
+        else:
+            pool[key] = create()
+            while len(pool) > self._rx_buffer_pool_size:
+                pool.popitem(last=False)
+        return pool[key]
+
     def rx_destroy_buffer(self):
         """rx_destroy_buffer: Clears RX buffer"""
         self._rxbuf = None
+        self._rx_si_cache = None
+        self._rx_sample_count = 0
+        self._rx_hw_timestamps = None
 
     def __del__(self):
         self._rxbuf = []
@@ -187,54 +558,70 @@ class rx_core(rx_tx_common, metaclass=ABCMeta):
                 v.enabled = False
         self._rxadc = []
 
-    def __get_rx_channel_scales(self):
-        rx_scale = []
-        for i in self.rx_enabled_channels:
-            v = self._rxadc.find_channel(self._rx_channel_names[i])
-            if "scale" in v.attrs:
-                scale = self._get_iio_attr(self._rx_channel_names[i], "scale", False)
-            else:
-                scale = 1.0
-            rx_scale.append(scale)
-        return rx_scale
-
-    def __get_rx_channel_offsets(self):
-        rx_offset = []
-        for i in self.rx_enabled_channels:
-            v = self._rxadc.find_channel(self._rx_channel_names[i])
-            if "offset" in v.attrs:
-                offset = self._get_iio_attr(self._rx_channel_names[i], "offset", False)
-            else:
-                offset = 0.0
-            rx_offset.append(offset)
-        return rx_offset
-
-    def __rx_unbuffered_data(self):
-        x = []
-        t = (
-            self._rx_data_si_type
-            if self._rx_output_type == "SI"
-            else self._rx_data_type
+    def _iio_attr_written(self, attr_name):
+        super()._iio_attr_written(attr_name)
+        if any(key in attr_name for key in self._rx_si_attr_keys):
+            self._rx_si_cache = None
+
+    def __rx_si_params(self):
+        """Scale and offset of each enabled channel.
+        Read once per channel configuration and kept until a scale, offset
+        or range attribute is written or the buffer is destroyed.
+        """
+        key = tuple(self.rx_enabled_channels)
+        if self._rx_si_cache is None or self._rx_si_cache[0] != key:
+            rx_scale = []
+            rx_offset = []
+            for i in self.rx_enabled_channels:
+                name = self._rx_channel_names[i]
+                attrs = find_channel(self._rxadc, name).attrs
+                if "scale" in attrs:
+                    rx_scale.append(self._get_iio_attr(name, "scale", False))
+                else:
+                    rx_scale.append(1.0)
+                if "offset" in attrs:
+                    rx_offset.append(self._get_iio_attr(name, "offset", False))
+                else:
+                    rx_offset.append(0.0)
+            self._rx_si_cache = (key, rx_scale, rx_offset)
+        return self._rx_si_cache[1], self._rx_si_cache[2]
+
+    def __rx_si_float_type(self):
+        t = np.dtype(self._rx_data_si_type)
+        return t if t.kind == "f" else np.dtype(np.float64)
+
+    def __rx_unbuffered_data(self, out=None):
+        if out is None:
+            t = (
+                self._rx_data_si_type
+                if self._rx_output_type == "SI"
+                else self._rx_data_type
+            )
+            out = [
+                np.zeros(self.rx_buffer_size, dtype=t)
+                for _ in range(len(self.rx_enabled_channels))
+            ]
+
+        key = tuple(self.rx_enabled_channels)
+        if self._rx_sampler is None or self._rx_sampler[0] != key:
+            names = [self._rx_channel_names[m] for m in self.rx_enabled_channels]
+            self._rx_sampler = (key, unbuffered_sampler(self._rxadc, names))
+        sampler = self._rx_sampler[1]
+        self._rx_unbuffered_timestamps = sampler.read(
+            out, rate=self._rx_unbuffered_rate
         )
-        for _ in range(len(self.rx_enabled_channels)):
-            x.append(np.zeros(self.rx_buffer_size, dtype=t))
+        self._rx_block_received(len(out[0]), self._rx_unbuffered_timestamps[-1])
 
-        # Get scalers first
         if self._rx_output_type == "SI":
-            rx_scale = self.__get_rx_channel_scales()
-            rx_offset = self.__get_rx_channel_offsets()
-
-        for samp in range(self.rx_buffer_size):
-            for i, m in enumerate(self.rx_enabled_channels):
-                raw = self._get_iio_attr(
-                    self._rx_channel_names[m], "raw", False, self._rxadc
-                )
-                if self._rx_output_type == "SI":
-                    x[i][samp] = (raw + rx_offset[i]) * rx_scale[i]
+            rx_scale, rx_offset = self.__rx_si_params()
+            for i, x in enumerate(out):
+                if x.dtype.kind == "f":
+                    x += rx_offset[i]
+                    x *= rx_scale[i]
                 else:
-                    x[i][samp] = raw
+                    np.copyto(x, (x + rx_offset[i]) * rx_scale[i], casting="unsafe")
 
-        return x
+        return out
 
     def __rx_complex(self):
         x = self._rx_buffered_data()
@@ -242,17 +629,22 @@ class rx_core(rx_tx_common, metaclass=ABCMeta):
             raise Exception(
                 "Complex data must have an even number of component channels"
             )
-        out = [x[i] + 1j * x[i + 1] for i in range(0, len(x), 2)]
+        dtype = self.__rx_complex_out_dtype(x[0])
+        out = [_iq_to_complex(x[i], x[i + 1], dtype) for i in range(0, len(x), 2)]
         # Don't return list if a single channel
         return out[0] if len(x) == 2 else out
 
     def __rx_non_complex(self):
         x = self._rx_buffered_data()
         if self._rx_output_type == "SI":
-            rx_scale = self.__get_rx_channel_scales()
-            rx_offset = self.__get_rx_channel_offsets()
+            rx_scale, rx_offset = self.__rx_si_params()
+            si_type = self.__rx_si_float_type()
             x = x if isinstance(x, list) else [x]
-            x = [rx_scale[i] * (x[i] + rx_offset[i]) for i in range(len(x))]
+            for i, xi in enumerate(x):
+                # Fused conversion: single output allocation, then in place
+                y = np.add(xi, rx_offset[i], dtype=si_type)
+                y *= rx_scale[i]
+                x[i] = y
         elif self._rx_output_type != "raw":
             raise Exception("_rx_output_type undefined")
 
@@ -267,6 +659,8 @@ class rx_core(rx_tx_common, metaclass=ABCMeta):
             An array or list of arrays when more than one receive channel
             is enabled containing samples from a channel or set of channels.
             Data will be complex when using a complex data device.
+            With rx_metadata set, a tuple of the data and a block_metadata
+            object is returned instead.
         """
         if self._rx_unbuffered_data:
             data = self.__rx_unbuffered_data()
@@ -276,11 +670,270 @@ class rx_core(rx_tx_common, metaclass=ABCMeta):
             else:
                 data = self.__rx_non_complex()
         if self._rx_annotated:
-            return self._annotate(
+            data = self._annotate(
                 data, self._rx_channel_names, self.rx_enabled_channels
             )
+        if self._rx_metadata:
+            return data, self.__rx_block_metadata()
         return data
 
+    async def arx(self):
+        """Awaitable rx(), run on the thread serializing access to this
+        device's context.
+
+        Cancelling the awaiting task while a refill is blocked cancels the
+        refill, through the stream on libiio v1 and the buffer on v0, and
+        destroys the buffer, so the next capture starts with a new buffer.
+        """
+        return await run_in_context(self, self.rx, on_cancel=self.__rx_cancel)
+
+    def _rx_buffer_cancel(self):
+        """Unblock a pending refill from another thread. The compat classes
+        cancel the object the refill waits on.
+        """
+        buf = self._rxbuf
+        if buf is not None and hasattr(buf, "cancel"):
+            buf.cancel()
+
+    def __rx_cancel(self):
+        self._rx_buffer_cancel()
+        # Runs after the interrupted rx() on the same executor
+        context_executor(self).submit(self.rx_destroy_buffer)
+
+    def rx_into(self, out):
+        """Receive data from hardware buffers into caller allocated arrays.
+
+        Samples are written directly into the provided arrays so repeated
+        captures do not allocate new output arrays. Rows or slices of a larger
+        array, such as the slots of a ring buffer, can be passed as outputs.
+
+        args: type=numpy.array or list of numpy.array
+            One array per channel in rx_enabled_channels, each of length
+            rx_buffer_size. A 2-D array with one row per channel is also
+            accepted. Arrays must be complex when using a complex data device.
+
+        returns: type=numpy.array or list of numpy.array
+            The out argument, filled with the received samples.
+        """
+        if isinstance(out, np.ndarray):
+            outs = [out] if out.ndim == 1 else list(out)
+        else:
+            outs = list(out)
+        if len(outs) != len(self.rx_enabled_channels):
+            raise Exception(
+                f"Expected {len(self.rx_enabled_channels)} output arrays, got {len(outs)}"
+            )
+
+        if self._rx_unbuffered_data:
+            if any(len(o) != len(outs[0]) for o in outs):
+                raise Exception("Output arrays must all have the same length")
+            self.__rx_unbuffered_data(outs)
+            return out
+
+        x = self._rx_buffered_data()
+        x = x if isinstance(x, list) else [x]
+
+        if self._complex_data:
+            if len(x) != 2 * len(outs):
+                raise Exception(
+                    "Complex data must have an even number of component channels"
+                )
+            for i, o in enumerate(outs):
+                if not np.iscomplexobj(o):
+                    raise Exception("Output arrays must be complex for complex data")
+                if len(o) != len(x[2 * i]):
+                    raise Exception("Output array length must match rx_buffer_size")
+                _iq_to_complex(x[2 * i], x[2 * i + 1], o.dtype, out=o)
+            return out
+
+        for i, o in enumerate(outs):
+            if len(o) != len(x[i]):
+                raise Exception("Output array length must match rx_buffer_size")
+        if self._rx_output_type == "SI":
+            rx_scale, rx_offset = self.__rx_si_params()
+            for i, o in enumerate(outs):
+                np.add(x[i], rx_offset[i], out=o, casting="unsafe")
+                np.multiply(o, rx_scale[i], out=o, casting="unsafe")
+        else:
+            for i, o in enumerate(outs):
+                np.copyto(o, x[i], casting="unsafe")
+        return out
+
+    def rx_stream(self, n_buffers=None, prefetch=2):
+        """Continuously receive data from hardware buffers.
+
+        A background thread refills and converts buffers while the caller
+        processes previously returned data, so hardware refill and host
+        processing overlap. Ready buffers are handed over through a queue
+        holding at most prefetch buffers. When the queue is full the newly
+        received buffer is discarded and counted in rx_stream_gaps.
+
+        rx() must not be called while a stream is active. The refill thread
+        is stopped when the generator is exhausted or closed.
+
+        args:
+            n_buffers: type=int
+                Number of buffers to yield. When None, buffers are yielded
+                until the generator is closed.
+            prefetch: type=int
+                Maximum number of ready buffers queued for the consumer.
+
+        returns: type=generator
+            Yields data in the same format as rx().
+        """
+        if prefetch < 1:
+            raise ValueError("prefetch must be at least 1")
+
+        ready = queue.Queue(maxsize=prefetch)
+        stop = threading.Event()
+        self._rx_stream_gaps = 0
+
+        def _put(item):
+            # Blocking put that gives up once the consumer has gone away
+            while not stop.is_set():
+                try:
+                    ready.put(item, timeout=0.1)
+                    return
+                except queue.Full:
+                    continue
+
+        def _refill():
+            delivered = 0
+            try:
+                while not stop.is_set():
+                    if n_buffers is not None and delivered >= n_buffers:
+                        break
+                    data = self.rx()
+                    try:
+                        ready.put_nowait(data)
+                        delivered += 1
+                    except queue.Full:
+                        self._rx_stream_gaps += 1
+            except Exception as ex:  # noqa: BLE001
+                # Hand refill errors over to the consumer thread
+                _put(ex)
+                return
+            _put(_rx_stream_end)
+
+        worker = threading.Thread(target=_refill, name="rx_stream", daemon=True)
+        worker.start()
+        try:
+            while True:
+                item = ready.get()
+                if item is _rx_stream_end:
+                    return
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            stop.set()
+            worker.join()
+
+    def rx_record(
+        self,
+        path,
+        n_buffers=None,
+        duration=None,
+        queue_size=8,
+        direct=False,
+        metadata=None,
+    ):
+        """Record received buffers to a raw file with constant memory use.
+
+        Buffers are captured on the calling thread and written by a separate
+        thread. Samples are stored as received, before complex or SI
+        conversion, interleaved per enabled channel. At most queue_size
+        buffers wait to be written; when the writer falls behind, newly
+        received buffers are discarded and counted in rx_record_dropped so
+        the capture never stalls.
+
+        A SigMF metadata file is written next to path with the sample type,
+        channel names, sample rate, LO frequency and gains read from the
+        device, so the recording can be read back with numpy.memmap.
+
+        args:
+            path: type=str
+                Data file to create. An existing file is overwritten.
+            n_buffers: type=int
+                Number of buffers to capture.
+            duration: type=float
+                Seconds to record for. Recording stops at whichever of
+                n_buffers and duration is reached first.
+            queue_size: type=int
+                Maximum number of buffers held in memory.
+            direct: type=bool
+                Write in 4096 byte aligned blocks with O_DIRECT where
+                supported, bypassing the page cache.
+            metadata: type=dict
+                Extra entries for the global section of the metadata file.
+
+        returns: type=int
+            Number of buffers written to the file.
+        """
+        if n_buffers is None and duration is None:
+            raise ValueError("n_buffers or duration must be given")
+        if self._rx_unbuffered_data:
+            raise Exception("rx_record() requires a device with buffer support")
+
+        if self._complex_data:
+            names = []
+            for m in self.rx_enabled_channels:
+                names.extend(self._rx_channel_names[m * 2 : m * 2 + 2])
+        else:
+            names = [self._rx_channel_names[m] for m in self.rx_enabled_channels]
+        meta_global, capture = self.__rx_record_metadata()
+        meta_global.update(metadata or {})
+
+        self._rx_record_dropped = 0
+        sink = None
+        captured = 0
+        start = time.monotonic()
+        try:
+            while n_buffers is None or captured < n_buffers:
+                if duration is not None and time.monotonic() - start >= duration:
+                    break
+                data = self._rx_buffered_data()
+                captured += 1
+                if not sink:
+                    # Sample type is known once the first buffer arrived
+                    sink = file_sink(
+                        path,
+                        data[0].dtype,
+                        names,
+                        complex_data=self._complex_data,
+                        sample_rate=self._first_property(
+                            ("rx_sample_rate", "sample_rate")
+                        ),
+                        background=True,
+                        queue_size=queue_size,
+                        metadata=meta_global,
+                        capture=capture,
+                        drop_when_full=True,
+                        direct=direct,
+                    )
+                sink.write_channels(data)
+                self._rx_record_dropped = sink.dropped
+        finally:
+            if sink:
+                sink.close()
+        return captured - self._rx_record_dropped
+
+    def __rx_record_metadata(self):
+        """SigMF global and capture entries describing the device state"""
+        meta_global = {"core:hw": type(self).__name__}
+        now = datetime.now(timezone.utc)
+        capture = {"core:datetime": now.strftime("%Y-%m-%dT%H:%M:%S.%fZ")}
+        lo = self._first_property(("rx_lo", "center_frequency"))
+        if lo is not None:
+            capture["core:frequency"] = float(lo)
+        gains = ["rx_hardwaregain"]
+        gains += [f"rx_hardwaregain_chan{m}" for m in self.rx_enabled_channels]
+        for name in gains:
+            gain = self._first_property((name,))
+            if gain is not None:
+                meta_global[f"adi:{name}"] = float(gain)
+        return meta_global, capture
+
     @abstractmethod
     def _rx_init_channels(self):
         """Initialize RX channels"""
@@ -296,15 +949,41 @@ class tx_core(dds, rx_tx_common, metaclass=ABCMeta):
     """Buffer handling for transmit devices"""
 
     _tx_buffer_size = 1024
+    # Number of blocks (kernel buffers) queued towards the hardware
+    _tx_buffer_num_blocks = 4
     _txdac: iio.Device = []
     _tx_channel_names: List[str] = []
     # Set to True if complex data for TX only, overrides _complex_data
     _tx_complex_data = None
     _tx_data_type = None
+    _tx_descriptors = []
     _txbuf = None
     _output_byte_filename = "out.bin"
     _push_to_file = False
     _tx_cyclic_buffer = False
+    _tx_normalized = False
+    _tx_saturate = False
+    # Interleave buffers reused by tx(), keyed by (shape, dtype)
+    _tx_workspaces = None
+    # Options of the file set by tx_to_file(), and its open sink
+    _tx_file_options = None
+    _tx_file_sink = None
+    # Background push used by tx_submit() and tx_stream()
+    _tx_stream_queue = None
+    _tx_stream_queue_size = 4
+    _tx_stream_worker = None
+    _tx_stream_feeder = None
+    _tx_stream_feeder_loop = False
+    _tx_stream_stop_event = None
+    _tx_stream_error = None
+    _tx_stream_underflows = 0
+    # Converter status register and TX underflow bit checked after pushes
+    _tx_status_reg = 0x80000088
+    _tx_underflow_mask = 0x1
+    _tx_underflow_check = False
+    _tx_stats = None
+    _tx_stream_callback = None
+    _tx_tuning_applied = False
 
     def __init__(self, tx_cyclic_buffer=False):
         N = 2 if self._complex_data else 1
@@ -316,6 +995,8 @@ class tx_core(dds, rx_tx_common, metaclass=ABCMeta):
 
     def __del__(self):
         self._txbuf = []
+        if self._tx_file_sink:
+            self._tx_file_sink.close()
         if hasattr("self", "_txdac") and self._txdac:
             for m in self._tx_channel_names:
                 v = self._txdac.find_channel(m)
@@ -332,6 +1013,21 @@ class tx_core(dds, rx_tx_common, metaclass=ABCMeta):
             return super()._complex_data
         return self._tx_complex_data
 
+    @property
+    def tx_kernel_buffers(self) -> int:
+        """tx_kernel_buffers: Number of blocks queued towards the hardware
+        for non-cyclic transmission. Used as the number of stream blocks with
+        libiio v1 and as the kernel buffer count with libiio v0. Takes effect
+        when the buffer is next created, see tx_destroy_buffer().
+        """
+        return self._tx_buffer_num_blocks
+
+    @tx_kernel_buffers.setter
+    def tx_kernel_buffers(self, value: int):
+        if int(value) < 1:
+            raise ValueError("tx_kernel_buffers must be at least 1")
+        self._tx_buffer_num_blocks = int(value)
+
     @property
     def tx_cyclic_buffer(self):
         """tx_cyclic_buffer: Enable cyclic buffer for TX"""
@@ -405,9 +1101,120 @@ class tx_core(dds, rx_tx_common, metaclass=ABCMeta):
                     raise Exception("TX mapping exceeds available channels")
         self.__tx_enabled_channels = value
 
+    @property
+    def tx_stream_queue_size(self) -> int:
+        """tx_stream_queue_size: Maximum number of chunks waiting to be pushed
+        by tx_submit() and tx_stream(). Producers block while the queue is full.
+        """
+        return self._tx_stream_queue_size
+
+    @tx_stream_queue_size.setter
+    def tx_stream_queue_size(self, value: int):
+        if value < 1:
+            raise ValueError("tx_stream_queue_size must be at least 1")
+        if self._tx_stream_worker:
+            raise Exception(
+                "TX stream is active, call tx_stream_stop() before "
+                "modifying tx_stream_queue_size"
+            )
+        self._tx_stream_queue_size = value
+
+    @property
+    def tx_stream_queue_depth(self) -> int:
+        """tx_stream_queue_depth: Number of submitted chunks not yet pushed to
+        the hardware buffer
+        """
+        if not self._tx_stream_queue:
+            return 0
+        return self._tx_stream_queue.qsize()
+
+    @property
+    def tx_stream_stats(self) -> stream_stats:
+        """tx_stream_stats: Buffer, sample, latency and underflow counters of
+        pushed buffers. Call reset() on it to start counting again.
+        """
+        if self._tx_stats is None:
+            self._tx_stats = stream_stats()
+        return self._tx_stats
+
+    @property
+    def tx_underflow_check(self) -> bool:
+        """tx_underflow_check: Read the DAC status register after every push
+        and count underflows in tx_stream_stats. Each check is a register
+        access, so it is disabled by default.
+        """
+        return self._tx_underflow_check
+
+    @tx_underflow_check.setter
+    def tx_underflow_check(self, value: bool):
+        if value and self._txdac:
+            # Clear flags left over from before monitoring started
+            self._status_flag(self._txdac, self._tx_status_reg, self._tx_underflow_mask)
+        self._tx_underflow_check = bool(value)
+
+    @property
+    def tx_stream_callback(self):
+        """tx_stream_callback: Function called with tx_stream_stats when an
+        underflow is detected. It runs on the thread pushing the buffer.
+        """
+        return self._tx_stream_callback
+
+    @tx_stream_callback.setter
+    def tx_stream_callback(self, value):
+        self._tx_stream_callback = value
+
+    def __tx_pushed(self, started: float):
+        stats = self.tx_stream_stats
+        stats._record(self._tx_buffer_size, time.monotonic() - started)
+        if not self._tx_underflow_check:
+            return
+        flag = self._status_flag(
+            self._txdac, self._tx_status_reg, self._tx_underflow_mask
+        )
+        if flag is None:
+            stats.status_available = False
+            self._tx_underflow_check = False
+        elif flag:
+            stats.underflows += 1
+            if self._tx_stream_callback:
+                self._tx_stream_callback(stats)
+
+    @property
+    def tx_stream_underflows(self) -> int:
+        """tx_stream_underflows: Number of times the push thread ran out of
+        submitted chunks before the next chunk arrived. Each occurrence is a
+        gap in the transmitted waveform.
+        """
+        return self._tx_stream_underflows
+
+    @property
+    def tx_normalized(self) -> bool:
+        """tx_normalized: When True, tx() expects samples between -1 and 1 and
+        scales them to the DAC full scale
+        """
+        return self._tx_normalized
+
+    @tx_normalized.setter
+    def tx_normalized(self, value: bool):
+        self._tx_normalized = bool(value)
+
+    @property
+    def tx_saturate(self) -> bool:
+        """tx_saturate: When True, samples outside of the DAC range are
+        clipped to full scale instead of wrapping around
+        """
+        return self._tx_saturate
+
+    @tx_saturate.setter
+    def tx_saturate(self, value: bool):
+        self._tx_saturate = bool(value)
+
     def tx_destroy_buffer(self):
         """tx_destroy_buffer: Clears TX buffer"""
+        self.tx_stream_stop()
+        self.__tx_file_sink_close()
         self._txbuf = None
+        self._tx_workspaces = None
 
     def tx(self, data_np=None):
         """Transmit data to hardware buffers for each channel index in
@@ -432,69 +1239,441 @@ class tx_core(dds, rx_tx_common, metaclass=ABCMeta):
                     return
             raise Exception("No DDS channels found for TX, TX zeroing does not apply")
 
-        if not self._tx_data_type:
-            # Find channel data format
-            chan_name = self._tx_channel_names[self.tx_enabled_channels[0]]
-            chan = self._txdac.find_channel(chan_name, True)
-            df = chan.data_format
-            fmt = ("i" if df.is_signed is True else "u") + str(df.length // 8)
-            fmt = ">" + fmt if df.is_be else fmt
-            self._tx_data_type = np.dtype(fmt)
-
         if self._txbuf and self.tx_cyclic_buffer:
             raise Exception(
                 "TX buffer has been submitted in cyclic mode. "
                 "To push more data the tx buffer must be destroyed first."
             )
+        if self._tx_stream_worker:
+            raise Exception(
+                "TX stream is active. Use tx_submit() or call tx_stream_stop() first."
+            )
+
+        data = self.__tx_pack(self.__tx_prepare(data_np))
+
+        self.__tx_send(data)
 
+    def __tx_send(self, data):
+        """Send interleaved data to the file sink or the hardware buffer"""
+        if self._tx_file_options is None and self._push_to_file:
+            # Legacy output: each buffer is appended and the file closed,
+            # without a metadata file
+            with open(self._output_byte_filename, "ab") as f:
+                f.write(np.ascontiguousarray(data))
+            return
+        if self._tx_file_options is None:
+            started = time.monotonic()
+            self._tx_buffer_push(data)
+            self.__tx_pushed(started)
+            return
+        if not self._tx_file_sink:
+            self._tx_file_sink = self.__tx_file_sink_create(data.dtype)
+        self._tx_file_sink.write(data)
+
+    def __tx_file_sink_create(self, dtype):
+        options = self._tx_file_options
         if self._complex_data:
-            if self._num_tx_channels_enabled == 1:
-                data_np = [data_np]
-
-            if len(data_np) != self._num_tx_channels_enabled:
-                raise Exception("Not enough data provided for channel mapping")
-
-            indx = 0
-            stride = self._num_tx_channels_enabled * 2
-            data = np.empty(stride * len(data_np[0]), dtype=self._tx_data_type)
-            for chan in data_np:
-                i = np.real(chan)
-                q = np.imag(chan)
-                data[indx::stride] = i.astype(self._tx_data_type)
-                data[indx + 1 :: stride] = q.astype(self._tx_data_type)
-                indx = indx + 2
+            names = []
+            for m in self.tx_enabled_channels:
+                names.extend(self._tx_channel_names[m * 2 : m * 2 + 2])
         else:
-            if self._num_tx_channels_enabled == 1:
-                data_np = [data_np]
+            names = [self._tx_channel_names[m] for m in self.tx_enabled_channels]
+        sink = file_sink(
+            options["path"],
+            dtype,
+            names,
+            complex_data=self._complex_data,
+            sample_rate=self._first_property(("tx_sample_rate", "sample_rate")),
+            append=options["append"],
+            background=options["background"],
+            metadata=options["metadata"],
+        )
+        # Reopening after tx_destroy_buffer() continues the same recording
+        options["append"] = True
+        return sink
+
+    def tx_to_file(self, path, background=False, metadata=None):
+        """Write transmitted data to a file instead of the hardware buffer.
+
+        Each call to tx() appends the interleaved buffer, exactly as it would
+        be pushed to hardware, to path. The file stays open until
+        tx_to_file_close() or tx_destroy_buffer() is called. A SigMF
+        metadata file with the sample type, channel names and sample rate is
+        written next to it, so the recording can be read back with
+        numpy.memmap.
+
+        args:
+            path: type=str
+                Data file to create. An existing file is overwritten.
+            background: type=bool
+                Write from a separate thread so tx() only copies the buffer.
+            metadata: type=dict
+                Extra entries for the global section of the metadata file.
+        """
+        self.tx_to_file_close()
+        self._tx_file_options = {
+            "path": path,
+            "append": False,
+            "background": background,
+            "metadata": metadata,
+        }
+
+    def tx_to_file_close(self):
+        """Close the file opened by tx_to_file() and send later data to the
+        hardware buffer again
+        """
+        self.__tx_file_sink_close()
+        self._tx_file_options = None
+
+    def __tx_file_sink_close(self):
+        if self._tx_file_sink:
+            sink, self._tx_file_sink = self._tx_file_sink, None
+            sink.close()
+
+    def __tx_prepare(self, data_np):
+        """Check data against the enabled channels and create the TX buffer
+        on first use. Returns data as a list with one array per channel.
+        """
+        if self._num_tx_channels_enabled == 1:
+            data_np = [data_np]
 
-            if len(data_np) != self._num_tx_channels_enabled:
-                raise Exception("Not enough data provided for channel mapping")
+        if len(data_np) != self._num_tx_channels_enabled:
+            raise Exception("Not enough data provided for channel mapping")
 
-            indx = 0
-            stride = self._num_tx_channels_enabled
-            data = np.empty(stride * len(data_np[0]), dtype=self._tx_data_type)
-            for chan in data_np:
-                data[indx::stride] = chan.astype(self._tx_data_type)
-                indx = indx + 1
+        self.__tx_buffer_open(len(data_np[0]))
+        return data_np
 
+    def __tx_buffer_open(self, length):
         if not self._txbuf:
             self.disable_dds()
-            self._tx_buffer_size = len(data) // stride
+            self._tx_buffer_size = length
             self._tx_init_channels()
 
-        if len(data) // stride != self._tx_buffer_size:
+        if length != self._tx_buffer_size:
             raise Exception(
                 "Buffer length different than data length. "
                 "Cannot change buffer length on the fly"
             )
 
-        # Send data to buffer
-        if self._push_to_file:
-            f = open(self._output_byte_filename, "ab")
-            f.write(bytearray(data))
-            f.close()
+    def __tx_dtype(self):
+        # Channel data format, unless overridden by the driver or user
+        if self._tx_data_type is not None:
+            return np.dtype(self._tx_data_type)
+        return self._tx_descriptors[0].raw_dtype
+
+    def __tx_pack(self, data_np):
+        """Interleave per channel data into the buffer sample layout.
+
+        Samples are written into a workspace which is reused while the
+        channel count, length and data type stay the same. Complex samples
+        are copied as (I, Q) pairs in a single pass per channel. When
+        tx_normalized or tx_saturate is set, samples are first staged as
+        float64 and scaled or clipped in place before the final cast.
+        """
+        dtype = self.__tx_dtype()
+        n = 2 if self._complex_data else 1
+        shape = (len(data_np[0]), n * len(data_np))
+        data = self.__tx_workspace(shape, dtype)
+        convert = self._tx_normalized or self._tx_saturate
+        stage = self.__tx_workspace(shape, np.float64) if convert else data
+
+        for indx, chan in enumerate(data_np):
+            if self._complex_data:
+                _iq_pack(stage[:, 2 * indx : 2 * indx + 2], chan)
+            else:
+                np.copyto(stage[:, indx], chan, casting="unsafe")
+
+        if convert:
+            low, high = self.__tx_full_scale(data.dtype)
+            if self._tx_normalized:
+                self.__tx_denormalize(stage, data.dtype)
+            if self._tx_saturate:
+                np.clip(stage, low, high, out=stage)
+            np.copyto(data, stage, casting="unsafe")
+        return data.reshape(-1)
+
+    def __tx_denormalize(self, stage, dtype):
+        """Scale float64 samples between -1 and 1 in place to the DAC range.
+        Unsigned formats map 0 to mid-scale.
+        """
+        low, high = self.__tx_full_scale(dtype)
+        if low == 0:
+            stage += 1
+            stage *= high / 2
         else:
-            self._tx_buffer_push(data)
+            stage *= high
+
+    def __tx_workspace(self, shape, dtype):
+        key = (shape, np.dtype(dtype))
+        if self._tx_workspaces is None:
+            self._tx_workspaces = {}
+        if key not in self._tx_workspaces:
+            self._tx_workspaces[key] = np.empty(shape, dtype=dtype)
+        return self._tx_workspaces[key]
+
+    def __tx_full_scale(self, dtype):
+        """Lowest and highest sample values accepted by the DAC, as stored in
+        the buffer. Formats with fewer bits than the storage size and a
+        shift hold samples in the upper bits, so the limits are shifted too.
+        """
+        if dtype.kind == "f":
+            return -1.0, 1.0
+        size = dtype.itemsize * 8
+        bits, shift = size, 0
+        if self._tx_descriptors:
+            desc = self._tx_descriptors[0]
+            bits = min(size, desc.bits)
+            if bits + desc.shift <= size:
+                shift = desc.shift
+        if dtype.kind == "u":
+            return 0, (2 ** bits - 1) << shift
+        return -(2 ** (bits - 1)) << shift, (2 ** (bits - 1) - 1) << shift
+
+    async def atx(self, data_np=None):
+        """Awaitable tx(), run on the thread serializing access to this
+        device's context. Pending calls are dropped when the awaiting task
+        is cancelled.
+        """
+        await run_in_context(self, self.tx, data_np)
+
+    def tx_submit(self, data_np, timeout=None):
+        """Queue data for transmission by a background push thread.
+
+        The first call creates the TX buffer and starts the push thread.
+        The thread interleaves queued chunks and pushes them to the hardware
+        buffer, so the caller only blocks while tx_stream_queue_size chunks
+        are already waiting. Chunks must all have the same length, which
+        sets the buffer size. Only non-cyclic buffers can be streamed.
+        The data is copied before it is queued, so the caller may reuse or
+        modify its arrays as soon as tx_submit() returns.
+
+        args:
+            data_np: type=numpy.array or list of numpy.array
+                Data in the same format as accepted by tx().
+            timeout: type=float
+                Seconds to wait for room in the queue. When None, wait
+                indefinitely. queue.Full is raised on timeout.
+        """
+        if self.tx_cyclic_buffer:
+            raise Exception("tx_submit() requires tx_cyclic_buffer to be False")
+        if not self.__tx_enabled_channels:
+            raise Exception("tx_enabled_channels must not be empty for tx_submit()")
+        self.__tx_stream_check()
+
+        # Packed on the push thread, which may run after the caller has
+        # already refilled its arrays
+        data_np = [np.array(chan) for chan in self.__tx_prepare(data_np)]
+        if not self._tx_stream_worker:
+            self.__tx_stream_start()
+        self._tx_stream_queue.put((False, data_np), timeout=timeout)
+
+    def tx_stream(self, source):
+        """Transmit every chunk produced by an iterable or generator.
+
+        Chunks are handed to tx_submit() and the call returns once all of
+        them have been pushed to the hardware buffer. The push thread is left
+        running so further chunks can follow without a gap.
+
+        args:
+            source: type=iterable
+                Yields data in the same format as accepted by tx().
+        """
+        for data_np in source:
+            self.tx_submit(data_np)
+        self.tx_stream_flush()
+
+    def tx_from_file(self, path, chunk=None, loop=False, dtype=None):
+        """Play back interleaved samples from a raw or SigMF file.
+
+        The file is memory mapped and read in chunks of chunk samples per
+        channel, which are handed to the push thread used by tx_submit().
+        Up to tx_stream_queue_size chunks are read ahead, so resident memory
+        does not depend on the file size. Playback runs in the background;
+        use tx_stream_flush() to wait for it to finish or tx_stream_stop()
+        to end it.
+
+        The file must hold samples interleaved in the buffer layout of the
+        enabled channels, as written by tx_to_file(). The last chunk is
+        padded with zeros unless loop is set. Float samples, such as those
+        of rf32_le or cf32_le SigMF recordings, are taken as normalized
+        between -1 and 1 and scaled to the DAC full scale as with
+        tx_normalized, clipping values outside of that range. Other sample
+        types must match the buffer data type.
+
+        args:
+            path: type=str
+                Raw or SigMF data file.
+            chunk: type=int
+                Samples per channel in each push. Defaults to the current
+                buffer size and must match it once the buffer exists.
+            loop: type=bool
+                Restart from the beginning of the file without a gap until
+                tx_stream_stop() is called.
+            dtype: type=numpy.dtype
+                Sample type of raw files without SigMF metadata. Defaults to
+                the buffer data type.
+        """
+        if self.tx_cyclic_buffer:
+            raise Exception("tx_from_file() requires tx_cyclic_buffer to be False")
+        if not self.__tx_enabled_channels:
+            raise Exception("tx_enabled_channels must not be empty for tx_from_file()")
+        if self._tx_stream_feeder:
+            raise Exception(
+                "File playback is active. Call tx_stream_stop() before starting another."
+            )
+        self.__tx_stream_check()
+
+        self.__tx_buffer_open(chunk or self._tx_buffer_size)
+        buffer_dtype = self.__tx_dtype()
+        n = self._num_tx_channels_enabled
+        frame = n * 2 if self._complex_data else n
+        source = file_source(path, frame, buffer_dtype if dtype is None else dtype)
+        channels = source.meta.get("core:num_channels", n)
+        if channels != n:
+            source.close()
+            raise Exception(
+                f"{path} holds {channels} channels but {n} are enabled for TX"
+            )
+        buffer_dtype = np.dtype(buffer_dtype)
+        normalized = source.dtype.kind == "f" and buffer_dtype.kind in "iu"
+        same = (source.dtype.kind, source.dtype.itemsize) == (
+            buffer_dtype.kind,
+            buffer_dtype.itemsize,
+        )
+        if not normalized and not same:
+            source.close()
+            raise Exception(
+                f"{path} holds {source.dtype} samples but the TX buffer "
+                f"expects {buffer_dtype}"
+            )
+
+        if not self._tx_stream_worker:
+            self.__tx_stream_start()
+        self._tx_stream_feeder_loop = loop
+        self._tx_stream_feeder = threading.Thread(
+            target=self.__tx_file_feed,
+            args=(
+                source,
+                buffer_dtype,
+                normalized,
+                frame * self._tx_buffer_size,
+                loop,
+                self._tx_stream_queue,
+                self._tx_stream_stop_event,
+            ),
+            name="tx_from_file",
+            daemon=True,
+        )
+        self._tx_stream_feeder.start()
+
+    def __tx_file_feed(self, source, dtype, normalized, size, loop, pending, stop):
+        # A chunk is reused only after the queue and the push thread have
+        # moved past it, which takes at most maxsize + 1 newer chunks
+        ring = [np.empty(size, dtype=dtype) for _ in range(pending.maxsize + 2)]
+        if normalized:
+            raw = np.empty(size, dtype=source.dtype)
+            stage = np.empty(size, dtype=np.float64)
+            low, high = self.__tx_full_scale(dtype)
+        position = 0
+        try:
+            for buf in itertools.cycle(ring):
+                position, n = source.read_into(
+                    raw if normalized else buf, position, loop
+                )
+                if not n:
+                    return
+                if normalized:
+                    np.copyto(stage, raw)
+                    self.__tx_denormalize(stage, dtype)
+                    np.clip(stage, low, high, out=stage)
+                    np.copyto(buf, stage, casting="unsafe")
+                while not stop.is_set():
+                    try:
+                        pending.put((True, buf), timeout=0.1)
+                        break
+                    except queue.Full:
+                        continue
+                if stop.is_set() or n < size:
+                    return
+        except Exception as ex:  # noqa: BLE001
+            # Hand read errors over to the caller
+            self._tx_stream_error = ex
+        finally:
+            source.close()
+
+    def tx_stream_flush(self):
+        """Wait until all submitted chunks have been pushed to the hardware
+        buffer. Errors raised by the push thread are re-raised here.
+        """
+        if self._tx_stream_feeder:
+            if self._tx_stream_feeder_loop:
+                raise Exception(
+                    "Looping file playback does not finish, use tx_stream_stop()"
+                )
+            self._tx_stream_feeder.join()
+            self._tx_stream_feeder = None
+        if self._tx_stream_queue:
+            self._tx_stream_queue.join()
+        self.__tx_stream_check()
+
+    def tx_stream_stop(self):
+        """Stop the push thread started by tx_submit() or tx_from_file(),
+        discarding chunks which have not been pushed yet.
+        """
+        if not self._tx_stream_worker:
+            return
+        self._tx_stream_stop_event.set()
+        if self._tx_stream_feeder:
+            self._tx_stream_feeder.join()
+            self._tx_stream_feeder = None
+        self._tx_stream_worker.join()
+        self._tx_stream_worker = None
+        self._tx_stream_queue = None
+
+    def __tx_stream_check(self):
+        if self._tx_stream_error:
+            ex, self._tx_stream_error = self._tx_stream_error, None
+            raise ex
+
+    def __tx_stream_start(self):
+        self._tx_stream_queue = queue.Queue(maxsize=self._tx_stream_queue_size)
+        self._tx_stream_stop_event = threading.Event()
+        self._tx_stream_error = None
+        self._tx_stream_underflows = 0
+        self._tx_stream_worker = threading.Thread(
+            target=self.__tx_stream_push,
+            args=(self._tx_stream_queue, self._tx_stream_stop_event),
+            name="tx_stream",
+            daemon=True,
+        )
+        self._tx_stream_worker.start()
+
+    def __tx_stream_push(self, pending, stop):
+        pushed = False
+        starved = False
+        while not stop.is_set():
+            try:
+                packed, data = pending.get_nowait()
+            except queue.Empty:
+                starved = starved or pushed
+                try:
+                    packed, data = pending.get(timeout=0.1)
+                except queue.Empty:
+                    continue
+            try:
+                if self._tx_stream_error:
+                    # Discard chunks after a failure so producers never block
+                    continue
+                if starved:
+                    self._tx_stream_underflows += 1
+                    starved = False
+                self.__tx_send(data if packed else self.__tx_pack(data))
+                pushed = True
+            except Exception as ex:  # noqa: BLE001
+                # Hand push errors over to the producer thread
+                self._tx_stream_error = ex
+            finally:
+                pending.task_done()
 
     @abstractmethod
     def _tx_buffer_push(self, data):
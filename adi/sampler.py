@@ -0,0 +1,80 @@
+# Copyright (C) 2026 Analog Devices, Inc.
+#
+# SPDX short identifier: ADIBSD
+
+import time
+from typing import List, Optional
+
+import iio
+import numpy as np
+
+from adi.attribute import get_numbers
+
+
+def _parse_raw(value: str):
+    """Parse a raw attribute, using int() for the common integer case"""
+    try:
+        return int(value)
+    except ValueError:
+        return get_numbers(value)
+
+
+class unbuffered_sampler:
+    """Sampling engine for devices without buffer support.
+
+    Samples are collected by reading the raw attribute of each channel. The
+    attribute handles are looked up once, all channels are read on every
+    tick, and ticks can be paced to a requested rate. Each tick is scheduled
+    relative to the start of the capture so timing errors do not accumulate.
+    """
+
+    def __init__(self, dev: iio.Device, channel_names: List[str]):
+        self._raw_attrs = []
+        for name in channel_names:
+            chan = dev.find_channel(name, False)
+            if not chan:
+                raise Exception("No channel found with name: " + name)
+            self._raw_attrs.append(chan.attrs["raw"])
+        self.achieved_rate = None
+        self.jitter = None
+
+    def read(
+        self,
+        out: List[np.ndarray],
+        timestamps: Optional[np.ndarray] = None,
+        rate: Optional[float] = None,
+    ):
+        """Fill out with one sample per channel per tick.
+
+        args:
+            out: type=list of numpy.array
+                One preallocated array per channel. The number of ticks is
+                the length of the arrays.
+            timestamps: type=numpy.array
+                Optional float64 array receiving the host time.monotonic()
+                value at the start of each tick.
+            rate: type=float
+                Ticks per second. When None, channels are read as fast as
+                possible.
+        """
+        n = len(out[0])
+        if timestamps is None:
+            timestamps = np.empty(n, dtype=np.float64)
+        period = 1.0 / rate if rate else 0.0
+        attrs = self._raw_attrs
+
+        start = time.monotonic()
+        for samp in range(n):
+            if period:
+                delay = start + samp * period - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+            timestamps[samp] = time.monotonic()
+            for i, attr in enumerate(attrs):
+                out[i][samp] = _parse_raw(attr.value)
+
+        if n > 1 and timestamps[-1] > timestamps[0]:
+            intervals = np.diff(timestamps[:n])
+            self.achieved_rate = (n - 1) / (timestamps[n - 1] - timestamps[0])
+            self.jitter = float(np.std(intervals))
+        return timestamps
@@ -0,0 +1,282 @@
+# Copyright (C) 2026 Analog Devices, Inc.
+#
+# SPDX short identifier: ADIBSD
+
+"""Share one RX capture stream with several processes.
+
+An rx_publisher owns the device buffer and writes each received buffer into
+a ring of slots in a multiprocessing.shared_memory block. Any number of
+rx_subscriber objects, in the same or other processes, attach to the block
+by name and read the buffers in order through the same rx() signature as
+the device.
+
+Layout of the shared memory block:
+    header: magic, version, slot count, channel count, samples per channel,
+        sequence number of the last published buffer, single channel flag
+        and sample dtype
+    slot sequence numbers: one uint64 per slot, 0 while being written
+    slots: one (channels, samples) array per slot
+"""
+
+import threading
+import time
+import uuid
+from multiprocessing import shared_memory
+from typing import Optional
+
+import numpy as np
+
+_MAGIC = 0x41444952  # "ADIR"
+_VERSION = 1
+_HEADER = np.dtype(
+    [
+        ("magic", "<u4"),
+        ("version", "<u4"),
+        ("slots", "<u8"),
+        ("channels", "<u8"),
+        ("length", "<u8"),
+        ("sequence", "<u8"),
+        ("single", "<u8"),
+        ("dtype", "S16"),
+    ]
+)
+_ALIGN = 64
+# Blocks created by publishers of this process, whose resource tracker
+# registration must survive subscribers attaching to them
+_published = set()
+
+
+def _data_offset(slots: int) -> int:
+    offset = _HEADER.itemsize + 8 * slots
+    return -(-offset // _ALIGN) * _ALIGN
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    """Attach to an existing block without taking ownership of it"""
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        pass
+    # Before Python 3.13 attaching registers the block with the resource
+    # tracker, which would unlink it when this process exits
+    shm = shared_memory.SharedMemory(name=name)
+    if name not in _published:
+        from multiprocessing import resource_tracker
+
+        resource_tracker.unregister(shm._name, "shared_memory")
+    return shm
+
+
+class _ring:
+    """numpy views of the header, slot sequence numbers and slots"""
+
+    def __init__(self, shm: shared_memory.SharedMemory):
+        self.shm = shm
+        self.header = np.ndarray((), dtype=_HEADER, buffer=shm.buf)
+        if self.header["magic"] != _MAGIC or self.header["version"] != _VERSION:
+            raise Exception(f"{shm.name} is not an RX shared buffer")
+        slots = int(self.header["slots"])
+        shape = (slots, int(self.header["channels"]), int(self.header["length"]))
+        dtype = np.dtype(self.header["dtype"].item().decode())
+        self.slots = slots
+        self.single = bool(self.header["single"])
+        self.slot_sequence = np.ndarray(
+            (slots,), dtype="<u8", buffer=shm.buf, offset=_HEADER.itemsize
+        )
+        self.data = np.ndarray(
+            shape, dtype=dtype, buffer=shm.buf, offset=_data_offset(slots)
+        )
+
+    def release(self):
+        # Views must be dropped before the block can be closed
+        self.header = self.slot_sequence = self.data = None
+        try:
+            self.shm.close()
+        except BufferError:
+            # Arrays returned by rx() are still alive, the mapping is
+            # released once they are garbage collected
+            pass
+
+
+class rx_publisher:
+    """Capture buffers from an RX device into a shared memory ring.
+
+    One buffer is captured on creation to learn the output layout. Later
+    buffers are received straight into the ring slots with rx_into(), so
+    the data is written once and read in place by every subscriber.
+
+    args:
+        dev: RX device object, configured before the publisher is created.
+            rx_metadata and rx_annotated must be disabled.
+        slots: type=int
+            Number of buffers in the ring. Subscribers can fall up to
+            slots - 1 buffers behind before buffers are skipped.
+        name: type=str
+            Shared memory block name. Generated when None.
+    """
+
+    def __init__(self, dev, slots: int = 8, name: Optional[str] = None):
+        if slots < 2:
+            raise ValueError("slots must be at least 2")
+        if getattr(dev, "rx_metadata", False) or getattr(dev, "rx_annotated", False):
+            raise Exception("rx_publisher does not support rx_metadata or rx_annotated")
+        first = dev.rx()
+        single = isinstance(first, np.ndarray)
+        channels = [first] if single else list(first)
+        length = len(channels[0])
+        dtype = channels[0].dtype
+
+        size = _data_offset(slots) + slots * len(channels) * length * dtype.itemsize
+        name = name or f"adi_rx_{uuid.uuid4().hex[:12]}"
+        self._shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        _published.add(self._shm.name)
+        header = np.ndarray((), dtype=_HEADER, buffer=self._shm.buf)
+        header[()] = (_MAGIC, _VERSION, slots, len(channels), length, 0, single, "")
+        header["dtype"] = dtype.str.encode()
+        del header
+        self._ring = _ring(self._shm)
+        self._ring.slot_sequence[:] = 0
+
+        self.dev = dev
+        self.sequence = 0
+        self._stop = None
+        self._thread = None
+        self._error = None
+        self._publish(lambda out: np.copyto(out, np.asarray(channels)))
+
+    @property
+    def name(self) -> str:
+        """name: Shared memory block name subscribers attach to"""
+        return self._shm.name
+
+    def publish(self, n_buffers: int = 1):
+        """Receive n_buffers buffers and publish them to the ring"""
+        for _ in range(n_buffers):
+            self._publish(self.dev.rx_into)
+
+    def _publish(self, fill):
+        ring = self._ring
+        seq = self.sequence + 1
+        k = seq % ring.slots
+        ring.slot_sequence[k] = 0
+        fill(ring.data[k])
+        ring.slot_sequence[k] = seq
+        ring.header["sequence"] = seq
+        self.sequence = seq
+
+    def start(self):
+        """Publish continuously from a background thread until stop()"""
+        if self._thread:
+            return
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, args=(self._stop,), name="rx_publisher", daemon=True
+        )
+        self._thread.start()
+
+    def _run(self, stop):
+        try:
+            while not stop.is_set():
+                self._publish(self.dev.rx_into)
+        except Exception as ex:  # noqa: BLE001
+            # Re-raised by stop()
+            self._error = ex
+
+    def stop(self):
+        """Stop the background thread started by start()"""
+        if not self._thread:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+        if self._error:
+            ex, self._error = self._error, None
+            raise ex
+
+    def close(self):
+        """Stop publishing and remove the shared memory block"""
+        try:
+            self.stop()
+        finally:
+            if self._ring:
+                self._ring.release()
+                self._ring = None
+                self._shm.unlink()
+                _published.discard(self._shm.name)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class rx_subscriber:
+    """Read buffers published by an rx_publisher, possibly in another process.
+
+    rx() returns buffers in publishing order in the same format as the
+    device rx(). By default the returned arrays are views into the ring, so
+    no data is copied. A view stays valid until the publisher wraps around
+    to its slot, which is at least slots - 1 buffers later. Use copy=True
+    to keep a buffer for longer.
+
+    args:
+        name: type=str
+            Shared memory block name, see rx_publisher.name.
+    """
+
+    def __init__(self, name: str):
+        self._ring = _ring(_attach(name))
+        # Start with the newest buffer available
+        self._next = max(int(self._ring.header["sequence"]), 1)
+        self.sequence = None
+        self.missed = 0
+
+    def rx(self, timeout: Optional[float] = None, copy: bool = False):
+        """Wait for and return the next published buffer.
+
+        args:
+            timeout: type=float
+                Seconds to wait for a new buffer. TimeoutError is raised
+                when it expires. When None, wait indefinitely.
+            copy: type=bool
+                Return copies instead of views into shared memory.
+        """
+        ring = self._ring
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            latest = int(ring.header["sequence"])
+            if latest < self._next:
+                if deadline is not None and time.monotonic() > deadline:
+                    raise TimeoutError("No buffer published before timeout")
+                time.sleep(0.0005)
+                continue
+            # The slot after the newest one may be written at any time
+            oldest = latest - ring.slots + 2
+            if self._next < oldest:
+                self.missed += oldest - self._next
+                self._next = oldest
+            k = self._next % ring.slots
+            data = ring.data[k]
+            if copy:
+                data = data.copy()
+            if int(ring.slot_sequence[k]) != self._next:
+                # Overwritten while being read, try the next one
+                self.missed += 1
+                self._next += 1
+                continue
+            self.sequence = self._next
+            self._next += 1
+            return data[0] if ring.single else list(data)
+
+    def close(self):
+        """Detach from the shared memory block"""
+        if self._ring:
+            self._ring.release()
+            self._ring = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,64 @@
+# Copyright (C) 2026 Analog Devices, Inc.
+#
+# SPDX short identifier: ADIBSD
+
+
+class stream_stats:
+    """Health counters of an RX or TX buffer stream.
+
+    Attributes:
+        buffers: Number of buffers received or pushed
+        samples: Number of samples per channel received or pushed
+        overflows: Number of buffers after which the ADC reported an overflow
+        underflows: Number of buffers after which the DAC reported an underflow
+        last_latency: Seconds spent in the last refill or push
+        max_latency: Longest refill or push in seconds
+        status_available: False once reading the converter status register
+            failed, for example without debug register access
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        """Set all counters back to zero"""
+        self.buffers = 0
+        self.samples = 0
+        self.overflows = 0
+        self.underflows = 0
+        self.last_latency = None
+        self.max_latency = None
+        self.status_available = True
+        self._total_latency = 0.0
+
+    @property
+    def mean_latency(self):
+        """mean_latency: Average refill or push time in seconds"""
+        if not self.buffers:
+            return None
+        return self._total_latency / self.buffers
+
+    def _record(self, samples: int, latency: float):
+        self.buffers += 1
+        self.samples += samples
+        self.last_latency = latency
+        self._total_latency += latency
+        if self.max_latency is None or latency > self.max_latency:
+            self.max_latency = latency
+
+    def as_dict(self) -> dict:
+        """Counters as a dictionary, for logging"""
+        return {
+            "buffers": self.buffers,
+            "samples": self.samples,
+            "overflows": self.overflows,
+            "underflows": self.underflows,
+            "last_latency": self.last_latency,
+            "max_latency": self.max_latency,
+            "mean_latency": self.mean_latency,
+            "status_available": self.status_available,
+        }
+
+    def __repr__(self):
+        items = ", ".join(f"{k}={v}" for k, v in self.as_dict().items())
+        return f"stream_stats({items})"
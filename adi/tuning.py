@@ -0,0 +1,228 @@
+# Copyright (C) 2026 Analog Devices, Inc.
+#
+# SPDX short identifier: ADIBSD
+
+"""Find and persist streaming settings per device class and URI type.
+
+tune_streaming() sweeps block counts and buffer sizes against a live
+device and measures sustained throughput and drop rate. The best block
+counts are stored in a JSON file keyed by device class and URI type, for
+example "ad9361:ip", and applied automatically the next time a buffer of a
+matching device is created. Buffer sizes change the length of the data
+returned by rx(), so the best one is stored as a recommendation only.
+
+The settings file is ~/.config/pyadi-iio/streaming.json unless the
+PYADI_IIO_STREAMING_SETTINGS environment variable names another path.
+"""
+
+import json
+import os
+import threading
+import time
+from typing import Optional, Sequence
+
+import numpy as np
+
+_SETTINGS_ENV = "PYADI_IIO_STREAMING_SETTINGS"
+# Libiio context backend names and the URI prefixes selecting them
+_BACKENDS = {"network": "ip", "usb": "usb", "local": "local", "serial": "serial"}
+# Throughput within this fraction of the best counts as equally good
+_THROUGHPUT_TOLERANCE = 0.05
+
+_settings = None
+_settings_lock = threading.Lock()
+
+
+def settings_path() -> str:
+    """Path of the file holding tuned streaming settings"""
+    path = os.environ.get(_SETTINGS_ENV)
+    if path:
+        return path
+    return os.path.join(
+        os.path.expanduser("~"), ".config", "pyadi-iio", "streaming.json"
+    )
+
+
+def _uri_type(dev) -> str:
+    uri = getattr(dev, "uri", None) or ""
+    if ":" in uri:
+        return uri.split(":", 1)[0]
+    ctx = getattr(dev, "_ctx", None)
+    name = getattr(ctx, "name", None)
+    return _BACKENDS.get(name, name or "local")
+
+
+def settings_key(dev) -> str:
+    """Key of dev in the settings file: device class and URI type"""
+    return f"{type(dev).__name__}:{_uri_type(dev)}"
+
+
+def _load_all() -> dict:
+    global _settings
+    if _settings is None:
+        try:
+            with open(settings_path()) as f:
+                _settings = json.load(f)
+        except (OSError, ValueError):
+            _settings = {}
+    return _settings
+
+
+def load_settings(dev) -> Optional[dict]:
+    """Tuned streaming settings stored for dev, or None"""
+    with _settings_lock:
+        return _load_all().get(settings_key(dev))
+
+
+def save_settings(dev, settings: dict):
+    """Merge settings into the entry of dev in the settings file"""
+    global _settings
+    path = settings_path()
+    with _settings_lock:
+        _settings = None
+        entry = _load_all().setdefault(settings_key(dev), {})
+        entry.update(settings)
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(_settings, f, indent=2, sort_keys=True)
+
+
+def clear_settings_cache():
+    """Read the settings file again on the next lookup"""
+    global _settings
+    with _settings_lock:
+        _settings = None
+
+
+def _measure(dev, direction: str, transfer, duration: float, min_buffers: int):
+    stats = getattr(dev, f"{direction}_stream_stats")
+    check = "rx_overflow_check" if direction == "rx" else "tx_underflow_check"
+    transfer()  # Open the buffer outside of the measurement
+    stats.reset()
+    start = time.monotonic()
+    while stats.buffers < min_buffers or time.monotonic() - start < duration:
+        transfer()
+    elapsed = time.monotonic() - start
+    events = stats.overflows if direction == "rx" else stats.underflows
+    # The check turns itself off when the status register cannot be read
+    available = stats.status_available and getattr(dev, check)
+    return {
+        "throughput": stats.samples / elapsed,
+        "drop_rate": events / stats.buffers if available else None,
+        "max_latency": stats.max_latency,
+    }
+
+
+def _best(results):
+    lowest = min(r["drop_rate"] or 0 for r in results)
+    candidates = [r for r in results if (r["drop_rate"] or 0) == lowest]
+    fastest = max(r["throughput"] for r in candidates)
+    good = [
+        r
+        for r in candidates
+        if r["throughput"] >= fastest * (1 - _THROUGHPUT_TOLERANCE)
+    ]
+    # Among equally fast settings use the least buffer memory
+    return min(good, key=lambda r: (r["blocks"] * r["buffer_size"], r["blocks"]))
+
+
+def _tx_zeros(dev, size: int):
+    dtype = np.complex64 if dev._complex_data else (dev._tx_data_type or np.int16)
+    data = [np.zeros(size, dtype=dtype) for _ in dev.tx_enabled_channels]
+    return data[0] if len(data) == 1 else data
+
+
+def tune_streaming(
+    dev,
+    direction: str = "rx",
+    blocks: Sequence[int] = (2, 4, 8, 16),
+    buffer_sizes: Optional[Sequence[int]] = None,
+    duration: float = 1.0,
+    min_buffers: int = 4,
+    save: bool = True,
+) -> dict:
+    """Sweep block counts and buffer sizes and keep the best combination.
+
+    Every combination streams for duration seconds and at least min_buffers
+    buffers. Overflows or underflows are counted through the converter
+    status register when it can be read, see rx_overflow_check. The best
+    combination has the lowest drop rate, then a throughput within 5% of
+    the fastest, then the least buffer memory. Its block count is applied
+    to dev and, with save set, persisted for this device class and URI
+    type.
+
+    args:
+        dev: Device with rx_core or tx_core buffers
+        direction: type=str
+            "rx" or "tx"
+        blocks: type=list of int
+            Block (kernel buffer) counts to try
+        buffer_sizes: type=list of int
+            Buffer sizes in samples to try. By default a quarter, one and
+            four times the current rx_buffer_size, or 1024 samples for TX.
+        duration: type=float
+            Seconds to stream each combination
+        min_buffers: type=int
+            Minimum number of buffers to stream each combination
+        save: type=bool
+            Store the result in the settings file
+
+    returns: type=dict
+        Best block count, buffer size, throughput in samples per second
+        and drop rate, plus the measurements of every combination under
+        "results".
+    """
+    if direction not in ("rx", "tx"):
+        raise ValueError("direction must be rx or tx")
+    if buffer_sizes is None:
+        size = dev.rx_buffer_size if direction == "rx" else 1024
+        buffer_sizes = sorted({max(size // 4, 64), size, size * 4})
+
+    blocks_attr = f"_{direction}_buffer_num_blocks"
+    check_attr = "rx_overflow_check" if direction == "rx" else "tx_underflow_check"
+    saved = {
+        blocks_attr: dev.__dict__.get(blocks_attr),
+        check_attr: getattr(dev, check_attr),
+    }
+    if direction == "rx":
+        saved["rx_buffer_size"] = dev.rx_buffer_size
+    else:
+        saved["tx_cyclic_buffer"] = dev.tx_cyclic_buffer
+        dev.tx_cyclic_buffer = False
+    destroy = getattr(dev, f"{direction}_destroy_buffer")
+
+    results = []
+    try:
+        setattr(dev, check_attr, True)
+        for size in buffer_sizes:
+            if direction == "rx":
+                dev.rx_buffer_size = size
+                transfer = dev.rx
+            else:
+                data = _tx_zeros(dev, size)
+                transfer = lambda: dev.tx(data)  # noqa: E731
+            for n in blocks:
+                destroy()
+                setattr(dev, blocks_attr, n)
+                result = _measure(dev, direction, transfer, duration, min_buffers)
+                result.update(blocks=n, buffer_size=size)
+                results.append(result)
+    finally:
+        destroy()
+        for name, value in saved.items():
+            if name == blocks_attr and value is None:
+                dev.__dict__.pop(blocks_attr, None)
+            else:
+                setattr(dev, name, value)
+
+    best = _best(results)
+    settings = {
+        f"{direction}_blocks": best["blocks"],
+        f"{direction}_buffer_size": best["buffer_size"],
+        f"{direction}_throughput": best["throughput"],
+        f"{direction}_drop_rate": best["drop_rate"],
+    }
+    setattr(dev, blocks_attr, best["blocks"])
+    if save:
+        save_settings(dev, settings)
+    return dict(settings, results=results)
@@ -0,0 +1,65 @@
+# Copyright (C) 2026 Analog Devices, Inc.
+#
+# SPDX short identifier: ADIBSD
+
+"""Compare attribute value parsing of get_numbers() and IIOAttr.
+
+Typical attribute strings are parsed repeatedly in two ways:
+
+* get_numbers: the general regular expression used by _get_iio_attr()
+* IIOAttr: the parser chosen once for the declared attribute type
+
+With --uri, reading rx_lo of an ad9361 through the hand written
+_get_iio_attr() path and through the IIOAttr property is timed as well.
+
+Example:
+    python attr_parse.py --uri ip:analog
+"""
+
+import argparse
+import time
+
+import adi
+from adi.attribute import _parse_float, _parse_int, _parse_list, get_numbers
+
+SAMPLES = [
+    ("int", "2400000000", _parse_int),
+    ("float", "30720000.000000", _parse_float),
+    ("float with unit", "71.000000 dB", _parse_float),
+    ("list", "[70000000 1 6000000000]", _parse_list),
+]
+
+
+def bench(fn, repeats):
+    start = time.perf_counter()
+    for _ in range(repeats):
+        fn()
+    return (time.perf_counter() - start) / repeats * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--uri", default=None)
+    parser.add_argument("--repeats", type=int, default=100000)
+    args = parser.parse_args()
+
+    print(f"{'value':<18}{'get_numbers':>14}{'IIOAttr':>10}{'speedup':>10}")
+    for name, value, parse in SAMPLES:
+        assert parse(value) == get_numbers(value), "Parsers disagree"
+        slow = bench(lambda: get_numbers(value), args.repeats)
+        fast = bench(lambda: parse(value), args.repeats)
+        print(f"{name:<18}{slow:>11.2f} us{fast:>7.2f} us{slow / fast:>9.1f}x")
+
+    if args.uri:
+        sdr = adi.ad9361(uri=args.uri)
+        repeats = max(args.repeats // 100, 1)
+        helper = bench(
+            lambda: sdr._get_iio_attr("altvoltage0", "frequency", True), repeats
+        )
+        prop = bench(lambda: sdr.rx_lo, repeats)
+        print(f"rx_lo through _get_iio_attr: {helper:8.1f} us")
+        print(f"rx_lo through IIOAttr:       {prop:8.1f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+# Copyright (C) 2026 Analog Devices, Inc.
+#
+# SPDX short identifier: ADIBSD
+
+"""Compare channel lookup through find_channel() and the channel table.
+
+Without --uri a device with --channels channels is simulated, whose
+find_channel() compares names one by one as libiio does. With --uri the
+channel attribute read of a real device is timed both ways, which also
+includes the creation of the channel objects by the Python bindings.
+
+Example:
+    python channel_lookup.py --uri ip:analog --device cf-ad9361-lpc
+"""
+
+import argparse
+import time
+
+import iio
+
+from adi.channel_table import channel_table, find_channel
+
+
+class _Channel:
+    def __init__(self, index):
+        self.id = f"voltage{index}"
+        self.name = None
+        self.output = False
+
+
+class _Device:
+    def __init__(self, count):
+        self.channels = [_Channel(i) for i in range(count)]
+
+    def find_channel(self, name, output=False):
+        for chan in self.channels:
+            if chan.output == output and name in (chan.id, chan.name):
+                return chan
+        return None
+
+
+def bench(fn, repeats):
+    start = time.perf_counter()
+    for _ in range(repeats):
+        fn()
+    return (time.perf_counter() - start) / repeats * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--uri", default=None)
+    parser.add_argument("--device", default=None, help="Device name with --uri")
+    parser.add_argument("--channels", type=int, default=256)
+    parser.add_argument("--repeats", type=int, default=10000)
+    args = parser.parse_args()
+
+    if args.uri:
+        ctx = iio.Context(args.uri)
+        dev = ctx.find_device(args.device) if args.device else ctx.devices[0]
+        chan = dev.channels[-1]
+        name, output = chan.id, chan.output
+        attr = next(iter(chan.attrs))
+        repeats = max(args.repeats // 100, 1)
+        print(f"{dev.name}: {len(dev.channels)} channels, reading {name}/{attr}")
+    else:
+        dev = _Device(args.channels)
+        name, output, attr = f"voltage{args.channels - 1}", False, None
+        repeats = args.repeats
+        print(f"Simulated device: {args.channels} channels, looking up {name}")
+
+    def direct():
+        chan = dev.find_channel(name, output)
+        return chan.attrs[attr].value if attr else chan
+
+    def table():
+        chan = find_channel(dev, name, output)
+        return chan.attrs[attr].value if attr else chan
+
+    build = bench(lambda: channel_table(dev), max(repeats // 100, 1))
+    slow = bench(direct, repeats)
+    fast = bench(table, repeats)
+    print(f"find_channel():     {slow:10.2f} us")
+    print(f"channel table:      {fast:10.2f} us ({slow / fast:.1f}x)")
+    print(f"table construction: {build:10.2f} us (once per device)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+# Copyright (C) 2026 Analog Devices, Inc.
+#
+# SPDX short identifier: ADIBSD
+
+"""Measure the host side cost of decoding small RX buffers.
+
+The same hardware block is decoded repeatedly in two ways:
+
+* per call: look up each channel, rebuild its numpy format from
+  data_format and copy it out with chan.read(), as rx() used to do
+* cached: use the channel descriptors and sample layout computed once
+  when the buffer was created
+
+Example:
+    python rx_overhead.py --uri ip:analog --classname adis16480 --buffer-size 16
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+import adi
+import adi.compat as cl
+from adi.compat import _rx_deinterleave
+
+
+def decode_per_call(dev, source):
+    out = []
+    for desc in dev._rx_descriptors:
+        chan = dev._rxadc.find_channel(desc.channel.id)
+        df = chan.data_format
+        fmt = ("i" if df.is_signed is True else "u") + str(df.length // 8)
+        out.append(np.frombuffer(chan.read(source), dtype=fmt))
+    return out
+
+
+def decode_cached(dev, source):
+    return _rx_deinterleave(source.read(), dev._rx_descriptors, dev._rx_layout, source)
+
+
+def bench(fn, repeats):
+    start = time.perf_counter()
+    for _ in range(repeats):
+        fn()
+    return (time.perf_counter() - start) / repeats * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--uri", default="ip:analog")
+    parser.add_argument("--classname", default="adis16480")
+    parser.add_argument("--buffer-size", type=int, default=16)
+    parser.add_argument("--repeats", type=int, default=2000)
+    args = parser.parse_args()
+
+    dev = getattr(adi, args.classname)(uri=args.uri)
+    dev.rx_buffer_size = args.buffer_size
+    dev.rx()  # Create the buffer
+
+    if cl._is_libiio_v1():
+        source = next(dev._rx_stream)
+    else:
+        dev._rxbuf.refill()
+        source = dev._rxbuf
+
+    for a, b in zip(decode_per_call(dev, source), decode_cached(dev, source)):
+        assert np.array_equal(a, b), "Decoders disagree"
+
+    per_call = bench(lambda: decode_per_call(dev, source), args.repeats)
+    cached = bench(lambda: decode_cached(dev, source), args.repeats)
+    print(f"Channels enabled: {len(dev._rx_descriptors)}")
+    print(f"Buffer size:      {args.buffer_size} samples")
+    print(f"Per call decode:  {per_call:8.1f} us")
+    print(f"Cached decode:    {cached:8.1f} us")
+    print(f"Speedup:          {per_call / cached:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,32 @@
+# Copyright (C) 2026 Analog Devices, Inc.
+#
+# SPDX short identifier: ADIBSD
+
+import argparse
+import json
+
+import numpy as np
+
+import adi
+
+parser = argparse.ArgumentParser(description="Record RX buffers to a SigMF file")
+parser.add_argument("--uri", default="ip:analog.local", help="Context URI")
+parser.add_argument("--output", default="capture.sigmf-data", help="Data file")
+parser.add_argument("--duration", type=float, default=10.0, help="Seconds")
+parser.add_argument("--direct", action="store_true", help="Use O_DIRECT writes")
+args = parser.parse_args()
+
+sdr = adi.Pluto(args.uri)
+sdr.sample_rate = int(2.4e6)
+sdr.rx_lo = int(1e9)
+sdr.rx_buffer_size = 2 ** 16
+
+written = sdr.rx_record(args.output, duration=args.duration, direct=args.direct)
+print(f"Recorded {written} buffers, {sdr.rx_record_dropped} dropped")
+
+# Read the recording back without loading it into memory
+with open(args.output.replace(".sigmf-data", ".sigmf-meta")) as f:
+    meta = json.load(f)
+data = np.memmap(args.output, dtype=meta["global"]["adi:dtype"], mode="r")
+iq = data.reshape(-1, 2)
+print("First samples:", iq[:4, 0] + 1j * iq[:4, 1])
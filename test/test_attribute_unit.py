@@ -0,0 +1,396 @@
+# Copyright (C) 2026 Analog Devices, Inc.
+#
+# SPDX short identifier: ADIBSD
+
+"""Unit tests for the attribute helpers in adi.attribute which do not need hardware."""
+
+import gc
+import threading
+import weakref
+from unittest.mock import MagicMock
+
+import pytest
+
+from adi.ad936x import ad9364
+from adi.attr_batch import attr_batch_error
+from adi.attribute import (
+    IIOAttr,
+    _parse_float,
+    _parse_int,
+    _parse_list,
+    attribute,
+    get_numbers,
+)
+from adi.channel_table import channel_table, find_channel, forget, lookup
+
+
+class _Attr:
+    """Attribute counting reads and writes of its value."""
+
+    def __init__(self, value):
+        self._value = value
+        self.reads = 0
+        self.writes = []
+
+    @property
+    def value(self):
+        self.reads += 1
+        return self._value
+
+    @value.setter
+    def value(self, value):
+        self.writes.append(value)
+        self._value = value
+
+
+class _AttrTestDevice(attribute):
+    def __init__(self, channel_attrs, dev_attrs=None):
+        self.attrs = {k: _Attr(v) for k, v in channel_attrs.items()}
+        channel = MagicMock()
+        channel.attrs = self.attrs
+        self.dev_attrs = {k: _Attr(v) for k, v in (dev_attrs or {}).items()}
+        self._ctrl = MagicMock()
+        self._ctrl.name = "dev"
+        self._ctrl.find_channel.return_value = channel
+        self._ctrl.attrs = self.dev_attrs
+
+
+def test_attr_cache_is_opt_in():
+    dev = _AttrTestDevice({"sampling_frequency": "1000"})
+    assert dev.attr_cache is None
+    dev._get_iio_attr("voltage0", "sampling_frequency", False)
+    dev._get_iio_attr("voltage0", "sampling_frequency", False)
+    assert dev.attrs["sampling_frequency"].reads == 2
+
+
+def test_attr_cache_hits_until_write():
+    dev = _AttrTestDevice(
+        {"sampling_frequency": "1000", "sampling_frequency_available": "1000 2000"}
+    )
+    cache = dev.attr_cache_enable(default_ttl=60)
+    for _ in range(3):
+        assert dev._get_iio_attr("voltage0", "sampling_frequency", False) == 1000
+        dev._get_iio_attr_str("voltage0", "sampling_frequency_available", False)
+    assert dev.attrs["sampling_frequency"].reads == 1
+    assert (cache.hits, cache.misses) == (4, 2)
+
+    dev._set_iio_attr("voltage0", "sampling_frequency", False, 2000)
+    assert dev._get_iio_attr("voltage0", "sampling_frequency", False) == 2000
+    assert dev.attrs["sampling_frequency"].reads == 2
+    # Values which never expire survive writes to other attributes
+    dev._get_iio_attr_str("voltage0", "sampling_frequency_available", False)
+    assert dev.attrs["sampling_frequency_available"].reads == 1
+
+
+def test_attr_cache_policies():
+    dev = _AttrTestDevice({"raw": "5", "scale": "0.5"}, {"temp": "30"})
+    cache = dev.attr_cache_enable(policies=[("scale", 0)])
+    assert cache.ttl("raw") == 0 and cache.ttl("in_voltage_available") > 1e9
+    for _ in range(2):
+        dev._get_iio_attr("voltage0", "raw", False)
+        dev._get_iio_attr("voltage0", "scale", False)
+        dev._get_iio_dev_attr("temp")
+    assert dev.attrs["raw"].reads == 2
+    assert dev.attrs["scale"].reads == 2
+    assert dev.dev_attrs["temp"].reads == 1
+    assert cache.hit_rate == pytest.approx(1 / 6)
+
+    dev.attr_cache_disable()
+    dev._get_iio_dev_attr("temp")
+    assert dev.dev_attrs["temp"].reads == 2
+
+
+class _TransientDevice:
+    """Device object as returned by each call of Context.find_device()."""
+
+    def __init__(self, dev_id, value, ctx=None):
+        self.attrs = {"temp": _Attr(value)}
+        if ctx is not None:
+            self.id = dev_id
+            self.ctx = ctx
+
+
+def test_attr_cache_transient_devices():
+    dev = _AttrTestDevice({})
+    dev.attr_cache_enable(default_ttl=60)
+    values = {"a": "100", "b": "200"}
+    # Freed objects may share an id(), which must not share cached values
+    for _ in range(3):
+        read = {
+            n: dev._get_iio_dev_attr("temp", _TransientDevice(n, v))
+            for n, v in values.items()
+        }
+        assert read == {"a": 100, "b": 200}
+
+    # Objects of the same libiio device share cached values
+    ctx = object()
+    assert dev._get_iio_dev_attr("temp", _TransientDevice("iio:device1", "1", ctx)) == 1
+    again = _TransientDevice("iio:device1", "2", ctx)
+    assert dev._get_iio_dev_attr("temp", again) == 1
+    assert again.attrs["temp"].reads == 0
+    other = _TransientDevice("iio:device2", "3", ctx)
+    assert dev._get_iio_dev_attr("temp", other) == 3
+
+
+def test_batch_coalesces_and_orders_writes():
+    dev = _AttrTestDevice({"a": "1", "b": "2", "c": "3"}, {"c": "4"})
+    dev._attr_dependencies = {"a": ["c"]}
+    order = []
+    dev._iio_attr_written = order.append
+    with dev.batch() as batch:
+        dev._set_iio_attr("voltage0", "a", False, 10)
+        dev._set_iio_attr("voltage0", "b", False, 20)
+        dev._set_iio_attr("voltage0", "b", False, 21)
+        dev._set_iio_attr("voltage0", "c", False, 30)
+        with dev.batch():
+            dev._set_iio_dev_attr("c", 5)
+        assert order == []
+    assert order == ["b", "c", "c", "a"]
+    assert dev.attrs["b"].writes == ["21"]
+    assert dev.dev_attrs["c"].writes == ["5"]
+    assert batch.dropped == 1
+
+
+def test_batch_drops_cached_values_and_reports_failures():
+    dev = _AttrTestDevice({"gain": "10", "frequency": "1000"})
+    dev.attr_cache_enable(default_ttl=60)
+    dev._get_iio_attr("voltage0", "gain", False)
+    dev._get_iio_attr("voltage0", "frequency", False)
+    with pytest.raises(attr_batch_error) as err:
+        with dev.batch() as batch:
+            # The changed value is written first and invalidates the cache
+            dev._set_iio_attr("voltage0", "frequency", False, 2000)
+            dev._set_iio_attr("voltage0", "gain", False, 10.0)
+            dev._set_iio_dev_attr("missing", 1)
+            dev._set_iio_dev_attr("missing_too", 2)
+    assert dev.attrs["gain"].writes == []
+    assert dev.attrs["frequency"].writes == ["2000"]
+    assert batch.dropped == 1
+    names = [name for name, _, _ in err.value.failures]
+    assert names == ["dev/missing", "dev/missing_too"]
+
+
+def test_batch_applies_driver_write_orderings():
+    dev = _AttrTestDevice(
+        {
+            "frequency": "1000",
+            "rf_bandwidth": "200",
+            "hardwaregain": "0",
+            "gain_control_mode": "slow_attack",
+            "sampling_frequency": "30",
+        }
+    )
+    dev._attr_dependencies = ad9364._attr_dependencies
+    order = []
+    dev._iio_attr_written = order.append
+    with dev.batch():
+        dev._set_iio_attr("altvoltage0", "frequency", True, 2000)
+        dev._set_iio_attr("voltage0", "hardwaregain", False, 10)
+        dev._set_iio_attr("voltage0", "rf_bandwidth", False, 100)
+        dev._set_iio_attr("voltage0", "gain_control_mode", False, "manual")
+        dev._set_iio_attr("voltage0", "sampling_frequency", False, 10)
+    assert order.index("sampling_frequency") < order.index("frequency")
+    assert order.index("sampling_frequency") < order.index("rf_bandwidth")
+    assert order.index("gain_control_mode") < order.index("hardwaregain")
+
+
+class _IIOAttrTestDevice(_AttrTestDevice):
+    frequency = IIOAttr("altvoltage0", "frequency", int, True, doc="frequency: LO")
+    gain = IIOAttr("voltage0", "hardwaregain", float)
+    mode = IIOAttr("voltage0", "gain_control_mode", str)
+    taps = IIOAttr(None, "taps", list, readonly=True)
+    channel_scale = IIOAttr(lambda self: self.channel, "scale", float, True)
+    channel = "voltage1"
+
+
+def test_iio_attr_parses_and_writes_through_helpers():
+    dev = _IIOAttrTestDevice(
+        {
+            "frequency": "2400000000",
+            "hardwaregain": "71.000000 dB",
+            "gain_control_mode": "manual",
+            "scale": "0.5",
+        },
+        {"taps": "[1 2 -3]"},
+    )
+    assert isinstance(_IIOAttrTestDevice.frequency, property)
+    assert _IIOAttrTestDevice.frequency.__doc__ == "frequency: LO"
+    assert dev.frequency == 2400000000 and isinstance(dev.frequency, int)
+    assert dev.gain == 71.0
+    assert dev.mode == "manual"
+    assert dev.taps == [1.0, 2.0, -3.0]
+    assert dev.channel_scale == 0.5
+    dev._ctrl.find_channel.assert_called_with("voltage1", True)
+
+    dev.frequency = 1000000000
+    dev.gain = 10
+    assert dev.attrs["frequency"].writes == ["1000000000"]
+    assert dev.attrs["hardwaregain"].writes == ["10.0"]
+    with pytest.raises(Exception, match="must be an int"):
+        dev.frequency = 1e9
+    with pytest.raises(AttributeError):
+        dev.taps = [1, 2]
+
+    dev.attr_cache_enable(default_ttl=60)
+    with dev.batch():
+        dev.mode = "fast_attack"
+        dev.mode = "manual"
+    assert dev.attrs["gain_control_mode"].writes == ["manual"]
+    dev.gain
+    dev.gain
+    assert dev.attr_cache.hits == 1
+
+
+@pytest.mark.parametrize(
+    "value", ["1000", "-3.5", "71.000000 dB", "1e6", "[1 1 100]", "0 1 2"]
+)
+def test_iio_attr_parsers_match_get_numbers(value):
+    expected = get_numbers(value)
+    if isinstance(expected, list):
+        assert _parse_list(value) == expected
+    else:
+        assert _parse_float(value) == expected
+        if float(expected).is_integer():
+            assert _parse_int(value) == expected
+
+
+class _Channel:
+    def __init__(self, id, name=None, output=False, label=None):
+        self.id = id
+        self.name = name
+        self.output = output
+        if label:
+            self.label = label
+        self.attrs = {"raw": _Attr("0")}
+
+
+class _ChannelDevice:
+    """Device comparing like libiio v1 objects, which makes it unhashable."""
+
+    def __init__(self, channels):
+        self._channels = channels
+        self.listed = 0
+        self.find_channel = MagicMock(return_value=None)
+
+    def __eq__(self, other):
+        return self is other
+
+    @property
+    def channels(self):
+        self.listed += 1
+        return self._channels
+
+
+def test_channel_table_lookup():
+    chans = [
+        _Channel("voltage0", "rx_a", label="adc0"),
+        _Channel("voltage0", output=True),
+        _Channel("voltage1", "voltage0", label="rx_a"),
+        _Channel("temp0", label="adc0_temp"),
+    ]
+    table = channel_table(_ChannelDevice(chans))
+    assert len(table) == 4
+    assert table.find("voltage0") is chans[0]
+    assert table.find("voltage0", True) is chans[1]
+    assert table.find("rx_a") is chans[0]
+    assert table.find("voltage1", True) is None
+    # Labels are only matched on request
+    assert table.find("adc0_temp") is None
+    assert table.find_label("adc0_temp") is chans[3]
+    assert table.find_label("rx_a") is chans[2]
+    assert table.find_label("adc0", True) is None
+
+
+def test_channel_table_built_once_and_used_by_helpers():
+    chans = [_Channel(f"voltage{i}") for i in range(64)]
+    ctrl = _ChannelDevice(chans)
+    dev = _AttrTestDevice({})
+    dev._ctrl = ctrl
+    for _ in range(3):
+        dev._set_iio_attr("voltage42", "raw", False, 7)
+        assert dev._get_iio_attr("voltage42", "raw", False) == 7
+    assert ctrl.listed == 1
+    assert lookup(ctrl) is lookup(ctrl)
+    forget(ctrl)
+    lookup(ctrl)
+    assert ctrl.listed == 2
+    assert chans[42].attrs["raw"].writes == ["7"] * 3
+    ctrl.find_channel.assert_not_called()
+    # Unknown names still go to libiio
+    assert find_channel(ctrl, "missing") is None
+    ctrl.find_channel.assert_called_once_with("missing", False)
+
+
+def test_channel_table_does_not_keep_devices_alive():
+    ctx = _Context()
+    chans = [_Channel(f"voltage{i}") for i in range(4)]
+    dev = _ChannelDevice(chans)
+    dev.ctx = ctx
+    for chan in chans:
+        # libiio v1 channels reference their device
+        chan._parent = dev
+    assert find_channel(dev, "voltage3") is chans[3]
+    dev_ref, ctx_ref = weakref.ref(dev), weakref.ref(ctx)
+    del dev, ctx, chans, chan
+    gc.collect()
+    assert dev_ref() is None
+    assert ctx_ref() is None
+
+
+class _Context:
+    pass
+
+
+def _multi_dev_ctrls(contexts):
+    ctrls = []
+    for i, ctx in enumerate(contexts):
+        ctrl = _ChannelDevice([_Channel("altvoltage0", output=True)])
+        ctrl.name = f"chip{i}"
+        ctrl.ctx = ctx
+        ctrl.threads = []
+        ctrls.append(ctrl)
+    return ctrls
+
+
+def test_multi_dev_parallel_keeps_order_per_context():
+    shared = _Context()
+    ctrls = _multi_dev_ctrls([_Context(), shared, _Context(), shared])
+    dev = _AttrTestDevice({})
+    dev.multi_dev_parallel = True
+    dev._set_iio_attr_multi_dev(["altvoltage0"], "raw", True, [1, 2, 3, 4], ctrls)
+    values = dev._get_iio_attr_str_multi_dev("altvoltage0", "raw", True, ctrls)
+    assert values == {"chip0": ["1"], "chip1": ["2"], "chip2": ["3"], "chip3": ["4"]}
+
+    threads = {}
+
+    def record(i, ctrl):
+        threads[i] = threading.get_ident()
+        return i
+
+    assert dev._multi_dev_run(ctrls, record) == [0, 1, 2, 3]
+    assert len({threads[0], threads[1], threads[2]}) == 3
+    assert threads[1] == threads[3]
+    assert threading.get_ident() not in threads.values()
+
+
+def test_multi_dev_parallel_raises_first_error_in_order():
+    ctrls = _multi_dev_ctrls([_Context(), _Context(), _Context()])
+    dev = _AttrTestDevice({})
+    dev.multi_dev_parallel = True
+    done = []
+
+    def write(i, ctrl):
+        if i > 0:
+            raise ValueError(ctrl.name)
+        done.append(i)
+
+    with pytest.raises(ValueError, match="chip1"):
+        dev._multi_dev_run(ctrls, write)
+    assert done == [0]
+
+    # Batched writes stay on the calling thread and are queued
+    dev.attr_cache_enable(default_ttl=60)
+    with dev.batch() as batch:
+        dev._set_iio_attr_multi_dev(["altvoltage0"], "raw", True, [5, 6, 7], ctrls)
+        assert len(batch) == 3
+    assert [c._channels[0].attrs["raw"].writes for c in ctrls] == [["5"], ["6"], ["7"]]
@@ -0,0 +1,836 @@
+# Copyright (C) 2026 Analog Devices, Inc.
+#
+# SPDX short identifier: ADIBSD
+
+"""Unit tests for the buffer handling in adi.rx_tx which do not need hardware."""
+
+import asyncio
+import itertools
+import json
+import threading
+import time
+from types import SimpleNamespace
+from unittest.mock import MagicMock, Mock
+
+import numpy as np
+import pytest
+
+from adi.aio import context_executor
+from adi.compat import (
+    _channel_descriptor,
+    _decode_samples,
+    _rx_deinterleave,
+    _rx_sample_layout,
+)
+from adi.rx_tx import rx_core, tx_core
+
+
+class _RxTestDevice(rx_core):
+    """rx_core with a software block source in place of the compat layer."""
+
+    _rx_channel_names = ["voltage0", "voltage1"]
+
+    def __init__(self, blocks):
+        self._blocks = iter(blocks)
+        rx_core.__init__(self, rx_buffer_size=4)
+
+    def _rx_init_channels(self):
+        pass
+
+    def _rx_buffered_data(self):
+        started = time.monotonic()
+        data = [np.array(b) for b in next(self._blocks)]
+        self._rx_refilled(started)
+        return data
+
+
+def _counting_blocks(n_chan=2, size=4):
+    for k in itertools.count():
+        yield [np.arange(size, dtype=np.int16) + k * 10 + c for c in range(n_chan)]
+
+
+def test_rx_stream_yields_requested_buffers_in_order():
+    dev = _RxTestDevice(_counting_blocks())
+    out = list(dev.rx_stream(n_buffers=3, prefetch=4))
+    assert len(out) == 3
+    assert [int(b[0][0]) for b in out] == [0, 10, 20]
+    assert dev.rx_stream_gaps == 0
+
+
+def test_rx_stream_close_stops_refill_thread():
+    dev = _RxTestDevice(_counting_blocks())
+    stream = dev.rx_stream(prefetch=2)
+    next(stream)
+    stream.close()
+    assert not any(t.name == "rx_stream" for t in threading.enumerate())
+
+
+def test_rx_stream_forwards_refill_errors():
+    def _failing():
+        yield [np.zeros(4, dtype=np.int16)] * 2
+        raise RuntimeError("refill failed")
+
+    dev = _RxTestDevice(_failing())
+    stream = dev.rx_stream(prefetch=1)
+    next(stream)
+    with pytest.raises(RuntimeError, match="refill failed"):
+        next(stream)
+
+
+def test_rx_stream_rejects_empty_queue():
+    dev = _RxTestDevice(_counting_blocks())
+    with pytest.raises(ValueError):
+        next(dev.rx_stream(prefetch=0))
+
+
+class _RxComplexTestDevice(_RxTestDevice):
+    _rx_channel_names = ["voltage0_i", "voltage0_q", "voltage1_i", "voltage1_q"]
+    _rx_complex_data = True
+
+
+def test_rx_into_fills_preallocated_arrays():
+    dev = _RxTestDevice(_counting_blocks())
+    out = np.zeros((2, 4), dtype=np.int16)
+    res = dev.rx_into(out)
+    assert res is out
+    np.testing.assert_array_equal(out[0], [0, 1, 2, 3])
+    np.testing.assert_array_equal(out[1], [1, 2, 3, 4])
+
+
+def test_rx_into_complex_matches_rx():
+    dev = _RxComplexTestDevice(_counting_blocks(n_chan=4))
+    ref = dev.rx()
+    dev._blocks = _counting_blocks(n_chan=4)
+    out = [np.empty(4, dtype=np.complex128) for _ in range(2)]
+    dev.rx_into(out)
+    np.testing.assert_array_equal(out[0], ref[0])
+    np.testing.assert_array_equal(out[1], ref[1])
+
+
+def test_rx_into_rejects_wrong_shape():
+    dev = _RxTestDevice(_counting_blocks())
+    with pytest.raises(Exception, match="Expected 2 output arrays"):
+        dev.rx_into(np.zeros(4, dtype=np.int16))
+    with pytest.raises(Exception, match="rx_buffer_size"):
+        dev.rx_into(np.zeros((2, 8), dtype=np.int16))
+
+
+def _chan(index, length, bits=None, shift=0, signed=True, be=False):
+    df = SimpleNamespace(
+        length=length,
+        bits=bits or length,
+        shift=shift,
+        is_signed=signed,
+        is_be=be,
+        repeat=1,
+    )
+    return _channel_descriptor(SimpleNamespace(index=index, data_format=df))
+
+
+def test_rx_sample_layout_aligns_channels_in_scan_order():
+    c0, c1, c2 = _chan(0, 16), _chan(1, 32), _chan(2, 16, be=True)
+    # Requested order differs from scan order
+    dtype, fields = _rx_sample_layout([c2, c0, c1], 10)
+    assert fields == ["c0", "c1", "c2"]
+    assert dtype.itemsize == 10
+    assert dtype.fields["c1"][1] == 0
+    assert dtype.fields["c2"][1] == 4
+    assert dtype.fields["c0"][1] == 8
+    assert dtype.fields["c0"][0] == np.dtype(">i2")
+
+
+def test_rx_sample_layout_leaves_repeated_channels_to_libiio():
+    repeated = _chan(1, 32)
+    repeated.repeat = 2
+    dtype, fields = _rx_sample_layout([_chan(0, 16), repeated], 16)
+    assert fields == ["c0", None]
+    assert list(dtype.names) == ["c0"]
+
+
+def test_rx_sample_layout_leaves_unknown_samples_to_libiio():
+    # A channel outside of descriptors with a lower scan index is enabled
+    chans = [_chan(1, 16), _chan(2, 16)]
+    assert _rx_sample_layout(chans, 6) == (None, [None, None])
+    raw = np.array([7, 1, 2, 7, 3, 4], dtype=np.int16).tobytes()
+    for chan, values in zip(chans, ([1, 3], [2, 4])):
+        chan.channel.read = Mock(return_value=np.array(values, np.int16).tobytes())
+    block = Mock()
+    x = _rx_deinterleave(raw, chans, _rx_sample_layout(chans, 6), block)
+    np.testing.assert_array_equal(x[0], [1, 3])
+    np.testing.assert_array_equal(x[1], [2, 4])
+
+
+@pytest.mark.parametrize("bits, shift", [(24, 8), (20, 0), (18, 0), (24, 0)])
+def test_decode_samples_sign_extends_partial_width(bits, shift):
+    values = np.array([0, 1, -1, 2 ** (bits - 1) - 1, -(2 ** (bits - 1))])
+    raw = ((values & (2 ** bits - 1)) << shift).astype(np.uint32)
+    raw |= np.uint32(2 ** shift - 1)  # Bits below the field are ignored
+    out = _decode_samples(raw, bits, shift)
+    assert out.dtype == np.int32
+    np.testing.assert_array_equal(out, values)
+
+
+def test_decode_samples_extracts_packed_unsigned_field():
+    # 24 bit differential sample with an 8 bit common mode byte below it
+    raw = np.array([0xFFFFFF12, 0x000001AB], dtype=np.uint32)
+    np.testing.assert_array_equal(_decode_samples(raw, 8, 0, False), [0x12, 0xAB])
+    np.testing.assert_array_equal(_decode_samples(raw, 24, 8), [-1, 1])
+    with pytest.raises(ValueError):
+        _decode_samples(raw, 24, 9)
+
+
+def test_rx_deinterleave_decodes_shifted_channels():
+    chans = [_chan(0, 16), _chan(1, 32, 24, 8)]
+    raw = np.zeros(2, dtype=[("c0", "<i2"), ("pad", "V2"), ("c1", "<u4")])
+    raw["c0"] = [5, -5]
+    raw["c1"] = [(-2 & 0xFFFFFF) << 8 | 0x7F, 3 << 8]
+    x = _rx_deinterleave(raw.tobytes(), chans, _rx_sample_layout(chans, 8), None)
+    np.testing.assert_array_equal(x[0], [5, -5])
+    np.testing.assert_array_equal(x[1], [-2, 3])
+    assert x[1].dtype == np.int32
+
+
+def test_rx_deinterleave_returns_native_views():
+    chans = [_chan(0, 16), _chan(1, 16, be=True)]
+    raw = bytearray(np.array([1, 2, 3, 4], dtype=">i2").tobytes())
+    np.frombuffer(raw, dtype="<i2")[0::2] = [1, 3]
+    x = _rx_deinterleave(raw, chans, _rx_sample_layout(chans, 4), None)
+    np.testing.assert_array_equal(x[0], [1, 3])
+    np.testing.assert_array_equal(x[1], [2, 4])
+    assert x[0].base is not None
+    assert x[1].dtype.isnative
+
+
+def test_rx_complex_defaults_to_complex64_for_int16():
+    dev = _RxComplexTestDevice(_counting_blocks(n_chan=4))
+    data = dev.rx()
+    assert data[0].dtype == np.complex64
+    np.testing.assert_array_equal(data[0].real, [0, 1, 2, 3])
+    np.testing.assert_array_equal(data[0].imag, [1, 2, 3, 4])
+    dev.rx_complex_dtype = np.complex128
+    assert dev.rx()[1].dtype == np.complex128
+    with pytest.raises(ValueError):
+        dev.rx_complex_dtype = np.float32
+
+
+def test_rx_complex_float32_is_viewed_in_place():
+    raw = np.arange(16, dtype=np.float32).reshape(4, 4)
+
+    class _Rx(_RxComplexTestDevice):
+        def _rx_buffered_data(self):
+            # Interleaved buffer channels as returned by the compat layer
+            return [raw[:, c] for c in range(4)]
+
+    data = _Rx(iter([])).rx()
+    assert data[0].dtype == np.complex64
+    assert np.shares_memory(data[1], raw)
+    np.testing.assert_array_equal(data[1], [2 + 3j, 6 + 7j, 10 + 11j, 14 + 15j])
+
+
+def test_iq_to_complex_from_adjacent_samples():
+    from adi.rx_tx import _iq_to_complex
+
+    raw = np.arange(12, dtype=np.int16).reshape(4, 3)
+    out = _iq_to_complex(raw[:, 0], raw[:, 1], np.complex64)
+    np.testing.assert_array_equal(out, raw[:, 0] + 1j * raw[:, 1])
+
+    raw = np.arange(12, dtype=np.float32).reshape(4, 3)
+    view = _iq_to_complex(raw[:, 0], raw[:, 1], np.complex64)
+    assert np.shares_memory(view, raw)
+    np.testing.assert_array_equal(view, raw[:, 0] + 1j * raw[:, 1])
+
+
+def test_rx_si_scales_are_cached_until_written():
+    dev = _RxTestDevice(_counting_blocks())
+    dev._rxadc = MagicMock()
+    dev._rxadc.find_channel.return_value.attrs = {"scale": None, "offset": None}
+    dev._ctrl = MagicMock()
+    values = {"scale": 0.5, "offset": 2}
+    dev._get_iio_attr = Mock(side_effect=lambda name, attr, output: values[attr])
+    dev.rx_output_type = "SI"
+
+    data = dev.rx()
+    np.testing.assert_allclose(data[0], [1.0, 1.5, 2.0, 2.5])
+    assert data[0].dtype == np.float64
+    dev.rx()
+    assert dev._get_iio_attr.call_count == 4
+
+    values["scale"] = 1.0
+    dev._set_iio_attr("voltage0", "scale", False, 1.0)
+    data = dev.rx()
+    assert dev._get_iio_attr.call_count == 8
+    np.testing.assert_allclose(data[0], [22, 23, 24, 25])
+
+    dev._set_iio_attr("voltage0", "sampling_frequency", False, 1000)
+    dev.rx()
+    assert dev._get_iio_attr.call_count == 8
+
+
+def test_rx_buffer_pool_reuses_and_evicts_configurations():
+    dev = _RxTestDevice(_counting_blocks())
+    dev.rx_buffer_pool_size = 2
+    create = Mock(side_effect=lambda: object())
+    a = dev._rx_buffer_pool_get("a", create)
+    dev._rx_buffer_pool_get("b", create)
+    assert dev._rx_buffer_pool_get("a", create) is a
+    dev._rx_buffer_pool_get("c", create)
+    assert list(dev._rx_buffer_pool) == ["a", "c"]
+    assert create.call_count == 3
+    dev.rx_buffer_pool_clear()
+    assert dev._rx_buffer_pool is None
+
+
+class _RxUnbufferedTestDevice(_RxTestDevice):
+    _rx_unbuffered_data = True
+    _rx_data_type = np.int32
+    _rx_data_si_type = float
+
+
+def _unbuffered_device(values):
+    dev = _RxUnbufferedTestDevice([])
+    chans = {
+        name: SimpleNamespace(attrs={"raw": SimpleNamespace(value=v)})
+        for name, v in zip(dev._rx_channel_names, values)
+    }
+    dev._rxadc = MagicMock()
+    dev._rxadc.find_channel.side_effect = lambda name, output=False: chans[name]
+    return dev
+
+
+def test_rx_unbuffered_reads_all_channels_per_tick():
+    dev = _unbuffered_device(["12", "-3"])
+    data = dev.rx()
+    np.testing.assert_array_equal(data[0], [12] * 4)
+    np.testing.assert_array_equal(data[1], [-3] * 4)
+    assert len(dev.rx_unbuffered_timestamps) == 4
+    dev.rx()
+    # Channel handles are looked up once per channel configuration
+    assert dev._rxadc.find_channel.call_count == 2
+
+
+def test_rx_unbuffered_paces_to_requested_rate():
+    dev = _unbuffered_device(["1", "2"])
+    dev.rx_unbuffered_rate = 200
+    out = np.zeros((2, 4), dtype=np.int32)
+    dev.rx_into(out)
+    ts = dev.rx_unbuffered_timestamps
+    assert ts[-1] - ts[0] >= 3 / 200 * 0.9
+    assert dev.rx_unbuffered_stats["rate"] < 250
+    np.testing.assert_array_equal(out[1], [2] * 4)
+
+
+def test_channel_descriptor_formats():
+    desc = _chan(3, 16, be=True)
+    assert desc.index == 3
+    assert desc.dtype == np.dtype("int16")
+    assert desc.raw_dtype == np.dtype(">i2")
+    desc = _chan(0, 32, bits=24, shift=8, signed=False)
+    assert desc.dtype == np.dtype("uint32")
+    assert (desc.bits, desc.shift) == (24, 8)
+
+
+class _TxTestDevice(tx_core):
+    """tx_core recording pushed buffers in place of the compat layer."""
+
+    _tx_channel_names = ["voltage0", "voltage1"]
+    _complex_data = False
+    _tx_data_type = np.int16
+
+    def __init__(self):
+        self.pushed = []
+        tx_core.__init__(self)
+
+    def disable_dds(self):
+        pass
+
+    def _tx_init_channels(self):
+        self._txbuf = True
+
+    def _tx_buffer_push(self, data):
+        self.pushed.append(data.copy())
+
+
+def test_tx_stream_pushes_chunks_in_order():
+    dev = _TxTestDevice()
+    chunks = [[np.full(4, k), np.full(4, -k)] for k in range(6)]
+    dev.tx_stream(iter(chunks))
+    assert [int(d[0]) for d in dev.pushed] == list(range(6))
+    np.testing.assert_array_equal(dev.pushed[1], [1, -1] * 4)
+    assert dev.tx_stream_queue_depth == 0
+    with pytest.raises(Exception, match="TX stream is active"):
+        dev.tx([np.zeros(4), np.zeros(4)])
+    dev.tx_destroy_buffer()
+    assert not any(t.name == "tx_stream" for t in threading.enumerate())
+
+
+def test_tx_submit_counts_underflows_and_reports_errors():
+    dev = _TxTestDevice()
+    dev.tx_submit([np.zeros(4), np.zeros(4)])
+    dev.tx_stream_flush()
+    time.sleep(0.05)
+    dev.tx_submit([np.ones(4), np.ones(4)])
+    dev.tx_stream_flush()
+    assert dev.tx_stream_underflows == 1
+    with pytest.raises(Exception, match="Buffer length different"):
+        dev.tx_submit([np.zeros(8), np.zeros(8)])
+
+    dev._tx_buffer_push = Mock(side_effect=RuntimeError("push failed"))
+    dev.tx_submit([np.zeros(4), np.zeros(4)])
+    with pytest.raises(RuntimeError, match="push failed"):
+        dev.tx_stream_flush()
+    dev.tx_stream_stop()
+
+
+def test_tx_submit_copies_caller_data():
+    dev = _TxTestDevice()
+    release = threading.Event()
+    push = dev._tx_buffer_push
+
+    def _blocking_push(data):
+        release.wait(5)
+        push(data)
+
+    dev._tx_buffer_push = _blocking_push
+    chunk = [np.arange(4), np.arange(4) + 10]
+    # The push thread blocks on the first chunk, so the second stays queued
+    dev.tx_submit([np.zeros(4), np.zeros(4)])
+    dev.tx_submit(chunk)
+    chunk[0][:] = -1
+    chunk[1][:] = -1
+    release.set()
+    dev.tx_stream_flush()
+    dev.tx_stream_stop()
+    np.testing.assert_array_equal(dev.pushed[1], [0, 10, 1, 11, 2, 12, 3, 13])
+
+
+class _TxComplexTestDevice(_TxTestDevice):
+    _tx_channel_names = ["voltage0_i", "voltage0_q", "voltage1_i", "voltage1_q"]
+    _complex_data = True
+
+
+def test_tx_packs_iq_into_reused_workspace():
+    dev = _TxComplexTestDevice()
+    dev.tx_enabled_channels = [0, 1]
+    iq = np.arange(4) + 1j * (np.arange(4) + 10)
+    dev.tx([iq, iq * 2])
+    np.testing.assert_array_equal(
+        dev.pushed[0][:8], [0, 10, 0, 20, 1, 11, 2, 22],
+    )
+    workspaces = dict(dev._tx_workspaces)
+    dev.tx([iq.astype(np.complex64), np.real(iq)])
+    np.testing.assert_array_equal(dev.pushed[1][:4], [0, 10, 0, 0])
+    assert all(dev._tx_workspaces[k] is w for k, w in workspaces.items())
+    dev.tx_destroy_buffer()
+    assert dev._tx_workspaces is None
+
+
+def test_tx_normalized_scales_and_saturates():
+    dev = _TxComplexTestDevice()
+    dev.tx_enabled_channels = [0]
+    dev.tx_normalized = True
+    dev.tx_saturate = True
+    dev.tx(np.array([0.5 - 1j, 2.0 + 0.25j]))
+    np.testing.assert_array_equal(dev.pushed[0], [16383, -32767, 32767, 8191])
+
+
+@pytest.mark.parametrize(
+    "signed, shift, expected",
+    [
+        (True, 0, [-2047, 0, 1023, 2047, -2048]),
+        (True, 4, [-32752, 0, 16376, 32752, -32768]),
+        (False, 0, [0, 2047, 3071, 4095, 0]),
+        (False, 4, [0, 32760, 49140, 65520, 0]),
+    ],
+)
+def test_tx_normalized_partial_width_formats(signed, shift, expected):
+    dev = _TxTestDevice()
+    dev._tx_data_type = np.int16 if signed else np.uint16
+    desc = _chan(0, 16, 12, shift, signed)
+    dev._tx_descriptors = [desc, desc]
+    dev.tx_normalized = True
+    dev.tx_saturate = True
+    x = np.array([-1.0, 0.0, 0.5, 1.0, -2.0])
+    dev.tx([x, x])
+    np.testing.assert_array_equal(dev.pushed[0][::2], expected)
+
+
+@pytest.mark.parametrize("background", [False, True])
+def test_tx_to_file_records_buffers_with_metadata(tmp_path, background):
+    dev = _TxComplexTestDevice()
+    dev.tx_enabled_channels = [0]
+    path = str(tmp_path / "tx.sigmf-data")
+    dev.tx_to_file(path, background=background, metadata={"core:hw": "test"})
+    iq = np.arange(4) + 1j * (np.arange(4) + 10)
+    dev.tx(iq)
+    dev.tx(iq * 2)
+    dev.tx_to_file_close()
+    assert dev.pushed == []
+
+    data = np.fromfile(path, dtype=np.int16)
+    np.testing.assert_array_equal(data[:4], [0, 10, 1, 11])
+    np.testing.assert_array_equal(data[8:12], [0, 20, 2, 22])
+    with open(str(tmp_path / "tx.sigmf-meta")) as f:
+        meta = json.load(f)["global"]
+    assert meta["core:datatype"] == "ci16_le"
+    assert meta["adi:channel_names"] == ["voltage0_i", "voltage0_q"]
+    assert meta["core:hw"] == "test"
+
+    dev.tx(iq)
+    assert len(dev.pushed) == 1
+
+
+def test_tx_push_to_file_appends(tmp_path):
+    dev = _TxTestDevice()
+    dev._push_to_file = True
+    dev._output_byte_filename = str(tmp_path / "out.bin")
+    for k in range(3):
+        dev.tx([np.full(4, k), np.full(4, k)])
+        # Every call leaves the complete file on disk
+        data = np.fromfile(dev._output_byte_filename, dtype=np.int16)
+        assert len(data) == 8 * (k + 1)
+    dev.tx_destroy_buffer()
+    dev.tx([np.full(4, 3), np.full(4, 3)])
+    data = np.fromfile(dev._output_byte_filename, dtype=np.int16)
+    np.testing.assert_array_equal(data[::8], [0, 1, 2, 3])
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["out.bin"]
+    assert dev.pushed == []
+
+
+def test_tx_from_file_plays_back_recording(tmp_path):
+    dev = _TxTestDevice()
+    path = str(tmp_path / "tx.sigmf-data")
+    dev.tx_to_file(path)
+    for k in range(5):
+        dev.tx([np.full(4, k), np.full(4, -k)])
+    dev.tx_destroy_buffer()
+    dev.tx_to_file_close()
+
+    dev.tx_from_file(path, chunk=8)
+    dev.tx_stream_flush()
+    assert len(dev.pushed) == 3
+    np.testing.assert_array_equal(dev.pushed[0][::2], [0] * 4 + [1] * 4)
+    np.testing.assert_array_equal(dev.pushed[2][1::2], [-4] * 4 + [0] * 4)
+    dev.tx_destroy_buffer()
+
+
+def test_tx_from_file_loops_raw_file(tmp_path):
+    path = str(tmp_path / "tx.bin")
+    np.arange(12, dtype=np.int16).tofile(path)
+    dev = _TxTestDevice()
+    dev.tx_stream_queue_size = 1
+    dev.tx_from_file(path, chunk=4, loop=True)
+    while len(dev.pushed) < 4:
+        time.sleep(0.01)
+    with pytest.raises(Exception, match="Looping"):
+        dev.tx_stream_flush()
+    dev.tx_stream_stop()
+    frames = np.concatenate(dev.pushed[:4])
+    np.testing.assert_array_equal(frames[:24], np.tile(np.arange(12), 2))
+    assert not any(t.name == "tx_from_file" for t in threading.enumerate())
+
+
+def test_tx_from_file_scales_float_recordings(tmp_path):
+    path = str(tmp_path / "tx.sigmf-data")
+    np.array([0.5, -0.5, 1.5, -1.0] * 2, dtype="<f4").tofile(path)
+    with open(str(tmp_path / "tx.sigmf-meta"), "w") as f:
+        json.dump({"global": {"core:datatype": "rf32_le"}}, f)
+    dev = _TxTestDevice()
+    dev.tx_from_file(path, chunk=4)
+    dev.tx_stream_flush()
+    np.testing.assert_array_equal(dev.pushed[0], [16383, -16383, 32767, -32767] * 2)
+    dev.tx_destroy_buffer()
+
+    np.arange(8, dtype=np.int32).tofile(str(tmp_path / "wide.bin"))
+    with pytest.raises(Exception, match="expects int16"):
+        dev.tx_from_file(str(tmp_path / "wide.bin"), chunk=4, dtype=np.int32)
+
+
+def test_rx_record_writes_interleaved_samples_and_metadata(tmp_path):
+    dev = _RxTestDevice(_counting_blocks())
+    dev.sample_rate = 1e6
+    path = str(tmp_path / "rx.sigmf-data")
+    assert dev.rx_record(path, n_buffers=3, direct=True) == 3
+    data = np.fromfile(path, dtype=np.int16).reshape(-1, 2)
+    np.testing.assert_array_equal(data[:, 0], np.r_[0:4, 10:14, 20:24])
+    np.testing.assert_array_equal(data[:, 1], data[:, 0] + 1)
+    with open(str(tmp_path / "rx.sigmf-meta")) as f:
+        meta = json.load(f)
+    assert meta["global"]["core:sample_rate"] == 1e6
+    assert meta["global"]["core:datatype"] == "ri16_le"
+    assert "core:datetime" in meta["captures"][0]
+
+
+def test_rx_record_drops_buffers_when_writer_is_slow(tmp_path, monkeypatch):
+    from adi.file_io import file_sink
+
+    write = file_sink._write_bytes
+
+    def _slow_write(self, buf):
+        time.sleep(0.02)
+        write(self, buf)
+
+    monkeypatch.setattr(file_sink, "_write_bytes", _slow_write)
+    dev = _RxTestDevice(_counting_blocks())
+    path = str(tmp_path / "rx.bin")
+    written = dev.rx_record(path, n_buffers=20, queue_size=1)
+    assert dev.rx_record_dropped > 0
+    assert written + dev.rx_record_dropped == 20
+    assert np.fromfile(path, dtype=np.int16).size == written * 8
+
+
+def test_rx_overflow_check_counts_and_clears_status():
+    dev = _RxTestDevice([])
+    dev._rxadc = Mock()
+    dev._rxadc.reg_read.side_effect = [0x4, 0x0, 0x6]
+    dev.rx_overflow_check = True  # Clears the stale flag
+    dev._rxadc.reg_write.assert_called_once_with(0x80000088, 0x4)
+    seen = []
+    dev.rx_stream_callback = lambda stats: seen.append(stats.overflows)
+    dev._rx_refilled(time.monotonic())
+    dev._rx_refilled(time.monotonic())
+    stats = dev.rx_stream_stats
+    assert (stats.buffers, stats.samples, stats.overflows) == (2, 8, 1)
+    assert seen == [1]
+    assert stats.max_latency >= stats.mean_latency >= 0
+
+    dev._rxadc.reg_read.side_effect = OSError("no debug access")
+    dev._rx_refilled(time.monotonic())
+    assert not stats.status_available
+    assert not dev.rx_overflow_check
+
+
+def test_tx_underflow_check_reads_status_after_push():
+    dev = _TxTestDevice()
+    dev._txdac = Mock()
+    dev._txdac.reg_read.return_value = 0x1
+    dev.tx_underflow_check = True
+    dev.tx([np.zeros(4), np.zeros(4)])
+    dev.tx([np.zeros(4), np.zeros(4)])
+    stats = dev.tx_stream_stats
+    assert (stats.buffers, stats.underflows) == (2, 2)
+    stats.reset()
+    assert stats.as_dict()["buffers"] == 0
+
+
+def test_rx_metadata_counts_samples_across_buffers():
+    dev = _RxTestDevice([[np.arange(4), np.arange(4)]] * 3)
+    assert isinstance(dev.rx(), list)
+    dev.rx_metadata = True
+    data, meta = dev.rx()
+    assert len(data) == 2
+    assert (meta.sample_index, meta.length, meta.hw_timestamps) == (4, 4, None)
+    np.testing.assert_array_equal(meta.sample_indexes, [4, 5, 6, 7])
+    times = meta.host_times(1000.0)
+    assert times[-1] == meta.timestamp
+    np.testing.assert_allclose(np.diff(times), 0.001)
+
+    dev.rx_destroy_buffer()
+    assert dev.rx()[1].sample_index == 0
+
+
+def test_tune_streaming_persists_and_applies_block_count(tmp_path, monkeypatch):
+    from adi import tuning
+
+    monkeypatch.setenv("PYADI_IIO_STREAMING_SETTINGS", str(tmp_path / "s.json"))
+    tuning.clear_settings_cache()
+    dev = _RxTestDevice(itertools.repeat([np.arange(4), np.arange(4)]))
+    dev._rx_buffer_num_blocks = 4
+    best = tuning.tune_streaming(dev, blocks=(2, 8), buffer_sizes=[4], duration=0)
+    assert len(best["results"]) == 2
+    assert best["rx_blocks"] in (2, 8) and best["rx_drop_rate"] is None
+    assert dev._rx_buffer_num_blocks == best["rx_blocks"]
+    assert dev.rx_buffer_size == 4 and not dev.rx_overflow_check
+
+    tuning.clear_settings_cache()
+    saved = json.loads((tmp_path / "s.json").read_text())
+    assert saved[tuning.settings_key(dev)]["rx_buffer_size"] == 4
+    other = _RxTestDevice([])
+    other._streaming_settings_apply("rx")
+    assert other._rx_buffer_num_blocks == best["rx_blocks"]
+
+    tx_dev = _TxTestDevice()
+    tx_best = tuning.tune_streaming(
+        tx_dev, "tx", blocks=(4,), buffer_sizes=[8], duration=0, save=False
+    )
+    assert tx_best["tx_blocks"] == 4 and len(tx_dev.pushed) == 5
+    tuning.clear_settings_cache()
+
+
+def test_v0_kernel_buffers_set_before_buffer_creation(monkeypatch):
+    import adi.compat as compat
+
+    class _Rx(compat.compat_libiio_v0_rx, _RxTestDevice):
+        pass
+
+    calls = []
+
+    def _buffer(*args):
+        calls.append("buffer")
+        return Mock()
+
+    dev = _Rx([])
+    dev._rxadc = MagicMock()
+    dev._rxadc.set_kernel_buffers_count.side_effect = lambda n: calls.append(n)
+    monkeypatch.setattr(compat.iio, "Buffer", _buffer, raising=False)
+    monkeypatch.setattr(compat, "_rx_sample_layout", lambda *args: None)
+    monkeypatch.setattr(compat, "_channel_descriptor", Mock())
+    dev.rx_kernel_buffers = 16
+    dev._rx_init_channels()
+    assert calls == [16, "buffer"]
+    with pytest.raises(ValueError):
+        dev.rx_kernel_buffers = 0
+
+
+def test_async_calls_share_one_thread_per_context():
+    ctx = Mock()
+    devs = [_RxTestDevice(_counting_blocks()) for _ in range(2)]
+    for dev in devs:
+        dev._ctx = ctx
+    other = _RxTestDevice(_counting_blocks())
+
+    async def _main():
+        data = await devs[0].arx()
+        await devs[1].aset("rx_buffer_size", 4)
+        assert await devs[1].aget("rx_buffer_size") == 4
+        threads = await asyncio.gather(
+            *(d.arun(threading.current_thread) for d in devs + [other])
+        )
+        return data, threads
+
+    data, threads = asyncio.run(_main())
+    np.testing.assert_array_equal(data[0], [0, 1, 2, 3])
+    assert threads[0] is threads[1]
+    assert threads[2] is not threads[0]
+
+
+def test_channel_objects_share_the_executor_of_their_device():
+    ctx = Mock()
+    ctrl = SimpleNamespace(ctx=ctx)
+    dev = SimpleNamespace(_ctx=ctx, _ctrl=ctrl)
+    # Channel classes such as ad5686_channel only hold the libiio device
+    channel = SimpleNamespace(_ctrl=ctrl)
+    executor = context_executor(dev)
+    assert context_executor(channel) is executor
+    assert context_executor(ctrl) is executor
+    assert context_executor(Mock(_ctx=None, ctx=None, _ctrl=None)) is not executor
+
+
+@pytest.mark.parametrize("version", ["v0", "v1"])
+def test_async_rx_cancel_interrupts_refill(version):
+    import adi.compat as compat
+
+    started = threading.Event()
+    release = threading.Event()
+    cancel = Mock(side_effect=lambda: release.set())
+    if version == "v1":
+
+        class _Rx(compat.compat_libiio_v1_rx, _RxTestDevice):
+            pass
+
+        dev = _Rx(_counting_blocks())
+        # iio.Buffer of libiio v1 cannot be cancelled, its stream can
+        dev._rxbuf = Mock(spec=[])
+        dev._rx_stream = Mock(cancel=cancel)
+    else:
+
+        class _Rx(compat.compat_libiio_v0_rx, _RxTestDevice):
+            pass
+
+        dev = _Rx(_counting_blocks())
+        dev._rxbuf = Mock(cancel=cancel)
+
+    def _blocked():
+        started.set()
+        release.wait(5)
+        raise RuntimeError("refill cancelled")
+
+    dev._rx_buffered_data = _blocked
+    dev.rx_destroy_buffer = Mock()
+
+    async def _main():
+        task = asyncio.ensure_future(dev.arx())
+        while not started.is_set():
+            await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        # The buffer is destroyed on the device thread after rx() returned
+        await dev.arun(lambda: None)
+
+    asyncio.run(_main())
+    cancel.assert_called_once()
+    dev.rx_destroy_buffer.assert_called_once()
+
+
+def test_shared_buffer_fans_out_in_order():
+    from adi.shared_buffer import rx_publisher, rx_subscriber
+
+    dev = _RxTestDevice(_counting_blocks())
+    with rx_publisher(dev, slots=4) as pub:
+        subs = [rx_subscriber(pub.name) for _ in range(2)]
+        pub.publish(2)
+        for sub in subs:
+            assert [int(sub.rx()[0][0]) for _ in range(3)] == [0, 10, 20]
+            assert sub.sequence == 3
+        with pytest.raises(TimeoutError):
+            subs[0].rx(timeout=0.01)
+
+        # A subscriber falling behind skips to the oldest intact slot
+        pub.publish(5)
+        data = subs[1].rx(copy=True)
+        assert int(data[1][0]) == 51
+        assert subs[1].missed == 2
+        for sub in subs:
+            sub.close()
+
+
+def test_shared_buffer_keeps_publisher_registration():
+    from multiprocessing import resource_tracker
+
+    from adi.shared_buffer import rx_publisher, rx_subscriber
+
+    dev = _RxTestDevice(_counting_blocks())
+    dev.rx_metadata = True
+    with pytest.raises(Exception, match="rx_metadata"):
+        rx_publisher(dev)
+    dev.rx_metadata = False
+
+    unregistered = []
+    unregister = resource_tracker.unregister
+
+    def _unregister(name, rtype):
+        unregistered.append(name)
+        unregister(name, rtype)
+
+    resource_tracker.unregister = _unregister
+    try:
+        with rx_publisher(dev, slots=4) as pub:
+            with rx_subscriber(pub.name) as sub:
+                assert int(sub.rx()[0][0]) == 0
+            # Attaching must not drop the registration of the owner
+            assert unregistered == []
+    finally:
+        resource_tracker.unregister = unregister
+
+
+def test_shared_buffer_across_processes():
+    import multiprocessing
+
+    from adi.shared_buffer import rx_publisher
+
+    dev = _RxTestDevice(_counting_blocks())
+    with rx_publisher(dev, slots=4) as pub:
+        ctx = multiprocessing.get_context("spawn")
+        with ctx.Pool(1) as pool:
+            result = pool.apply_async(_subscriber_first_values, (pub.name, 2))
+            time.sleep(0.5)
+            pub.publish(2)
+            assert result.get(timeout=30) == [10, 20]
+
+
+def _subscriber_first_values(name, n):
+    from adi.shared_buffer import rx_subscriber
+
+    with rx_subscriber(name) as sub:
+        sub._next = 2
+        return [int(sub.rx(timeout=10)[0][0]) for _ in range(n)]